@@ -0,0 +1,837 @@
+import asyncio
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+from cache_store import DomainCache, HttpCache, LLMCache
+from founder_rules import extract_founders, filter_founder_names
+from llm_client import GroqChat
+from model_router import ModelRouter
+from network import HostResolver, HttpTransport
+from page_extract import extract_sections
+from progress import STARTED, reporting, set_detail, stage, tracked
+from prompt_compaction import compact_website_content
+from rate_limit import INTERACTIVE
+
+# Path keywords of pages worth crawling, most useful first
+CRAWL_KEYWORDS = ('about', 'team', 'company', 'mission', 'story', 'product', 'solution', 'service', 'careers')
+ABOUT_HINTS = ('about', 'team', 'company', 'mission', 'story')
+PRODUCT_HINTS = ('product', 'solution', 'service')
+
+# Text blocks kept per field from each page, and in total after merging
+PAGE_LIMITS = {'about': 3, 'products': 3, 'main_content': 10}
+CRAWL_LIMITS = {'about': 6, 'products': 6, 'main_content': 20}
+
+# Error sink and findings of the research call running in this task,
+# scoped like progress.py's reporter
+_call = ContextVar('research_call', default=None)
+
+
+@contextmanager
+def research_call(errors: Optional[Callable[[str], None]] = None):
+    """
+    Scope of one research call. Errors reported inside go to errors (or to
+    the enclosing call's sink), and the yielded dict collects the call's
+    prompt report and founder source.
+    """
+    outer = _call.get()
+    if errors is None and outer is not None:
+        errors = outer['errors']
+    state = {'errors': errors, 'prompt_tokens': None, 'founder_source': None}
+    token = _call.set(state)
+    try:
+        yield state
+    finally:
+        _call.reset(token)
+
+
+async def collect_errors(coro, errors: Callable[[str], None]):
+    """Await coro with the errors it reports sent to errors"""
+    with research_call(errors):
+        return await coro
+
+
+def _record(name: str, value):
+    call = _call.get()
+    if call is not None:
+        call[name] = value
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so trivially different links to one page compare equal"""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().removeprefix('www.')
+    path = parsed.path.rstrip('/').lower() or '/'
+    return f"{host}{path}"
+
+
+# Headers to avoid being blocked
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class AsyncCompanyResearcher:
+    def __init__(self, groq_api_key: str, probe_workers: int = 6,
+                 domain_cache: Optional[DomainCache] = None,
+                 resolver: Optional[HostResolver] = None,
+                 transport: Optional[HttpTransport] = None,
+                 max_concurrent_companies: int = 8, crawl_max_pages: int = 6,
+                 crawl_max_bytes: int = 3_000_000, crawl_timeout: float = 12.0,
+                 max_page_bytes: int = 1_500_000,
+                 http_cache: Optional[HttpCache] = None,
+                 llm_cache: Optional[LLMCache] = None,
+                 analysis_token_budget: int = 2000,
+                 llm_priority: int = INTERACTIVE,
+                 model_router: Optional[ModelRouter] = None,
+                 error_handler: Optional[Callable[[str], None]] = None,
+                 progress_handler: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialize the async Company Researcher with Groq API key for Llama models.
+        It keeps no per-call state, so one instance can serve concurrent calls.
+        """
+        self.groq_api_key = groq_api_key
+        # llm_priority is the scheduler lane (INTERACTIVE or BATCH) of its Groq calls
+        self.llm = GroqChat(groq_api_key, cache=llm_cache, priority=llm_priority, router=model_router)
+        self.probe_workers = max(1, probe_workers)
+        self.domain_cache = domain_cache
+        self.resolver = resolver if resolver is not None else HostResolver()
+        self.headers = dict(DEFAULT_HEADERS)
+        # Pooled client for every request; http_cache only applies to the default one
+        self.transport = transport if transport is not None else HttpTransport(headers=self.headers, cache=http_cache)
+        self.max_concurrent_companies = max(1, max_concurrent_companies)
+        # Crawl mode budget: pages (landing page included), bytes and seconds
+        self.crawl_max_pages = crawl_max_pages
+        self.crawl_max_bytes = crawl_max_bytes
+        self.crawl_timeout = crawl_timeout
+        # Cap per page download; non-HTML responses are dropped before their body
+        self.max_page_bytes = max_page_bytes
+        # Estimated tokens of website content pasted into the analysis prompt
+        self.analysis_token_budget = analysis_token_budget
+        # Defaults for calls that pass no error sink or progress handler
+        self.error_handler = error_handler
+        self.progress_handler = progress_handler
+        self._company_limit = None
+
+    def report_error(self, message: str):
+        call = _call.get()
+        if call is not None and call['errors'] is not None:
+            call['errors'](message)
+        elif self.error_handler is not None:
+            self.error_handler(message)
+        else:
+            print(message, file=sys.stderr)
+
+    def connection_stats(self) -> dict:
+        """
+        Connection reuse counters of the underlying HTTP transport
+        """
+        return self.transport.stats()
+
+    def llm_cache_stats(self) -> Optional[dict]:
+        """
+        Hit/miss counters of the LLM response cache, None if there is none
+        """
+        return self.llm.cache_stats()
+
+    def scheduler_stats(self) -> dict:
+        """
+        Queue depth, admission waits and retries of the Groq rate-limit scheduler
+        """
+        return self.llm.scheduler.stats()
+
+    def router_stats(self) -> dict:
+        """
+        Per-task model latency and escalation counters of the model router
+        """
+        return self.llm.router.stats()
+
+    async def aclose(self):
+        await self.transport.aclose()
+        await self.llm.aclose()
+
+    async def research_company(self, company_name: str, crawl: bool = False,
+                               progress: Optional[Callable[[Dict], None]] = None,
+                               errors: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Research one company: website discovery, scrape and analysis run as
+        one task and founder search as another, concurrently.
+
+        Each stage (website, scrape, analysis, founders, and research around
+        them all) reports started/finished events to progress, or to
+        progress_handler when no handler is passed. Errors go to errors,
+        when given, instead of error_handler. The result carries the
+        analysis prompt's token report ('prompt_tokens') and whether rules
+        or the LLM named the founders ('founder_source').
+        """
+        if self._company_limit is None:
+            self._company_limit = asyncio.Semaphore(self.max_concurrent_companies)
+
+        async with self._company_limit:
+            with research_call(errors) as call, reporting(progress or self.progress_handler, company_name), \
+                    stage('research'):
+                (website_url, website_content, analysis), founders = await asyncio.gather(
+                    self._research_website(company_name, crawl),
+                    self.find_founders(company_name),
+                )
+                set_detail(website_url or 'no website found')
+
+        result = {
+            'company_name': company_name,
+            'website_url': website_url,
+            'analysis': analysis,
+            'raw_content': website_content,
+            'founders': founders,
+        }
+        if call['prompt_tokens'] is not None:
+            result['prompt_tokens'] = call['prompt_tokens']
+        if call['founder_source'] is not None:
+            result['founder_source'] = call['founder_source']
+        if not website_url:
+            result['error'] = 'Could not find company website'
+        elif not website_content:
+            result['error'] = 'Could not scrape website content'
+        return result
+
+    async def research_events(self, company_name: str, crawl: bool = False,
+                              errors: Optional[Callable[[str], None]] = None) -> AsyncIterator[Dict]:
+        """
+        research_company as a stream of progress events, for callers that
+        render them as they happen. The last event is the finished
+        'research' stage with the result dict under 'result'.
+        """
+        queue = asyncio.Queue()
+        task = asyncio.ensure_future(self.research_company(company_name, crawl, progress=queue.put_nowait,
+                                                           errors=errors))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        final = None
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                if event['stage'] == 'research' and event['status'] != STARTED:
+                    final = event
+                    continue
+                yield event
+            yield dict(final or {}, result=task.result())
+        finally:
+            task.cancel()
+
+    async def _research_website(self, company_name: str, crawl: bool = False):
+        website_url = await self.search_company_website(company_name)
+        if not website_url:
+            return None, {}, ''
+
+        website_content = await self.scrape_website_content(website_url, crawl)
+        if not website_content:
+            return website_url, {}, ''
+
+        analysis = await self.analyze_with_llm(company_name, website_content)
+        return website_url, website_content, analysis
+
+    @tracked('website', describe=lambda website: website or 'not found')
+    async def search_company_website(self, company_name: str) -> Optional[str]:
+        """
+        Search for company website using multiple methods
+        """
+        if self.domain_cache is not None:
+            found, website = await asyncio.to_thread(self.domain_cache.get, company_name)
+            if found:
+                return website
+
+        try:
+            website = await self._discover_website(company_name)
+        except Exception as e:
+            # Not cached: a search that failed says nothing about the company
+            self.report_error(f"DuckDuckGo search error: {e}")
+            return None
+
+        if self.domain_cache is not None:
+            await asyncio.to_thread(self.domain_cache.set, company_name, website)
+
+        return website
+
+    async def _discover_website(self, company_name: str) -> Optional[str]:
+        """
+        Run the full website discovery chain, bypassing the cache
+
+        None means the search ran and found nothing; a search that could
+        not run (network down, DuckDuckGo blocking us) raises instead.
+        """
+        # Method 1: Try common domain patterns first
+        website = await self._try_common_domains(company_name)
+        if website:
+            return website
+
+        # Method 2: Try DuckDuckGo search
+        website = await self._search_duckduckgo(company_name)
+        if website:
+            return website
+
+        return None
+
+    async def _try_common_domains(self, company_name: str) -> Optional[str]:
+        """
+        Try common domain patterns for the company
+        """
+        candidates = await asyncio.to_thread(self.resolver.filter_urls, self._candidate_domains(company_name))
+        return await self._probe_first_valid(candidates)
+
+    def _candidate_domains(self, company_name: str) -> List[str]:
+        """
+        Build candidate website URLs for the company, in priority order
+        """
+        clean_name = company_name.lower().replace(' ', '').replace('.', '').replace(',', '').replace('-', '')
+
+        patterns = [
+            f"https://www.{clean_name}.com",
+            f"https://{clean_name}.com",
+            f"https://www.{clean_name}.ai",
+            f"https://{clean_name}.ai",
+            f"https://www.{clean_name}.io",
+            f"https://{clean_name}.io",
+            f"https://www.{clean_name}.co",
+            f"https://{clean_name}.co",
+        ]
+
+        hyphen_name = company_name.lower().replace(' ', '-').replace('.', '').replace(',', '')
+        patterns.extend([
+            f"https://www.{hyphen_name}.com",
+            f"https://{hyphen_name}.com",
+            f"https://www.{hyphen_name}.ai",
+            f"https://{hyphen_name}.ai",
+            f"https://www.{hyphen_name}.io",
+            f"https://{hyphen_name}.io",
+        ])
+
+        # Single-word names produce the same hyphenated patterns twice
+        return list(dict.fromkeys(patterns))
+
+    async def _probe_url(self, url: str) -> bool:
+        """
+        Check whether a candidate URL answers with 200
+        """
+        try:
+            response = await self.transport.head(url, timeout=5)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def _probe_first_valid(self, urls: List[str]) -> Optional[str]:
+        """
+        Probe candidate URLs concurrently and return the highest-priority hit
+        """
+        if not urls:
+            return None
+
+        limit = asyncio.Semaphore(self.probe_workers)
+
+        async def probe(url):
+            async with limit:
+                return await self._probe_url(url)
+
+        tasks = [asyncio.ensure_future(probe(url)) for url in urls]
+        try:
+            # Results are consumed in priority order, so a later candidate that
+            # answers first only wins once every earlier one has failed
+            for url, task in zip(urls, tasks):
+                if await task:
+                    return url
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _search_duckduckgo(self, company_name: str) -> Optional[str]:
+        """
+        Search using DuckDuckGo
+
+        Errors propagate, and so does a non-200 answer (DuckDuckGo serves
+        202 or 403 pages without results when it throttles us), so that a
+        failed search is never taken for "no website".
+        """
+        search_query = f"{company_name} official website"
+        ddg_url = f"https://html.duckduckgo.com/html/?q={search_query.replace(' ', '+')}"
+
+        response = await self.transport.get(ddg_url, timeout=10)
+        if response.status_code != 200:
+            raise ValueError(f"DuckDuckGo answered {response.status_code}")
+        soup = BeautifulSoup(response.content, 'html.parser')
+
+        links = soup.find_all('a', class_='result__a')
+
+        candidates = []
+        for link in links[:5]:
+            url = link.get('href')
+            if url and self._is_likely_company_website(url, company_name):
+                candidates.append(url)
+
+        return await self._probe_first_valid(candidates)
+
+    def _is_likely_company_website(self, url: str, company_name: str) -> bool:
+        """
+        Check if URL is likely the company's official website
+        """
+        excluded_domains = [
+            'linkedin.com', 'facebook.com', 'twitter.com', 'instagram.com',
+            'glassdoor.com', 'indeed.com', 'crunchbase.com', 'wikipedia.org',
+            'youtube.com', 'bloomberg.com', 'reuters.com', 'techcrunch.com'
+        ]
+
+        parsed_url = urlparse(url)
+        domain = parsed_url.netloc.lower()
+
+        for excluded in excluded_domains:
+            if excluded in domain:
+                return False
+
+        company_words = company_name.lower().split()
+        for word in company_words:
+            if len(word) > 3 and word in domain:
+                return True
+
+        return True
+
+    @tracked('scrape', describe=lambda content: f"{sum(len(text) for text in content.values()):,} characters")
+    async def scrape_website_content(self, url: str, crawl: bool = False) -> Dict[str, str]:
+        """
+        Scrape and extract relevant content from company website
+
+        With crawl, same-domain about/team/company/product/careers pages
+        linked from the landing page are fetched concurrently within the
+        page, byte and time budgets and their content merged in.
+        """
+        try:
+            deadline = time.monotonic() + self.crawl_timeout
+            response = await self.transport.fetch_text(url, max_bytes=self.max_page_bytes, timeout=10)
+            if response is None:
+                raise ValueError(f"{url} is not an HTML page")
+            page = extract_sections(response.text)
+
+            links = self._crawl_links(url, page['links']) if crawl else []
+            pages = [(url, page)]
+
+            if links:
+                seen = {canonical_url(url), canonical_url(response.url)}
+                byte_budget = self.crawl_max_bytes - response.bytes_read
+                pages.extend(await self._fetch_pages(links, seen, byte_budget, deadline))
+
+            return self._merge_sections(pages)
+
+        except Exception as e:
+            self.report_error(f"Error scraping website: {e}")
+            return {}
+
+    def _merge_sections(self, pages: List) -> Dict[str, str]:
+        """
+        Merge per-page sections into the content dict, dropping repeated blocks
+        """
+        content = {'title': '', 'description': ''}
+        merged = {field: [] for field in PAGE_LIMITS}
+        seen = set()
+
+        def add(field, texts):
+            for text in texts[:PAGE_LIMITS[field]]:
+                if text not in seen:
+                    seen.add(text)
+                    merged[field].append(text)
+
+        for url, sections in pages:
+            content['title'] = content['title'] or sections['title']
+            content['description'] = content['description'] or sections['description']
+
+            path = urlparse(url).path.lower()
+            add('about', sections['about'])
+            add('products', sections['products'])
+            # Paragraphs of an about or product page describe exactly that
+            if any(hint in path for hint in ABOUT_HINTS):
+                add('about', sections['main_content'])
+            elif any(hint in path for hint in PRODUCT_HINTS):
+                add('products', sections['main_content'])
+            else:
+                add('main_content', sections['main_content'])
+
+        for field, texts in merged.items():
+            content[field] = ' '.join(texts[:CRAWL_LIMITS[field]])
+        return content
+
+    def _crawl_links(self, base_url: str, hrefs: List[str]) -> List[str]:
+        """
+        Same-domain links worth crawling, most useful first, within the page budget
+        """
+        base_host = urlparse(base_url).netloc.lower().removeprefix('www.')
+        seen = {canonical_url(base_url)}
+        ranked = []
+
+        for href in hrefs:
+            link = urljoin(base_url, href)
+            parsed = urlparse(link)
+            if parsed.scheme not in ('http', 'https'):
+                continue
+            if parsed.netloc.lower().removeprefix('www.') != base_host:
+                continue
+
+            path = parsed.path.lower()
+            rank = next((i for i, keyword in enumerate(CRAWL_KEYWORDS) if keyword in path), None)
+            canonical = canonical_url(link)
+            if rank is None or canonical in seen:
+                continue
+            seen.add(canonical)
+            ranked.append((rank, len(ranked), link.split('#')[0]))
+
+        ranked.sort()
+        return [link for _, _, link in ranked[:max(self.crawl_max_pages - 1, 0)]]
+
+    async def _fetch_pages(self, urls: List[str], seen: set, byte_budget: int, deadline: float) -> List:
+        """
+        Fetch crawl pages concurrently, stopping at the byte or time budget
+        """
+        # Each page may use the whole remaining byte budget; the total is
+        # enforced as pages arrive
+        max_bytes = min(self.max_page_bytes, byte_budget)
+        tasks = {
+            asyncio.ensure_future(self.transport.fetch_text(
+                url, max_bytes=max_bytes, timeout=max(deadline - time.monotonic(), 0.1)
+            )): index
+            for index, url in enumerate(urls)
+        }
+        pending = set(tasks)
+        pages = []
+
+        try:
+            while pending and byte_budget > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    try:
+                        response = task.result()
+                    except Exception:
+                        continue
+                    if response is None or response.status_code != 200:
+                        continue
+
+                    # Redirects may land on a page that was already fetched
+                    canonical = canonical_url(response.url)
+                    if canonical in seen:
+                        continue
+                    if response.bytes_read > byte_budget:
+                        byte_budget = 0
+                        continue
+                    seen.add(canonical)
+                    byte_budget -= response.bytes_read
+
+                    pages.append((tasks[task], response.url, extract_sections(response.text)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # Merge in link priority order, not completion order
+        pages.sort(key=lambda page: page[0])
+        return [(url, sections) for _, url, sections in pages]
+
+    @tracked('founders', describe=lambda founders: ', '.join(founders) or 'none found')
+    async def find_founders(self, company_name: str, use_cache: bool = True) -> List[str]:
+        """
+        Search for founder names using multiple search approaches
+
+        Names the search snippets state outright are taken by the rules in
+        founder_rules; the LLM is only asked when those find nothing.
+        """
+        try:
+            # Try Google first (for AI Overview content)
+            search_query = f"{company_name} founder"
+            founder_content = await self._search_google_for_founders(search_query)
+
+            # If Google fails, try DuckDuckGo
+            if not founder_content:
+                founder_content = await self._search_duckduckgo_for_founders(search_query)
+
+            if not founder_content:
+                return []
+
+            # Names stated outright ("founded by X and Y") need no LLM call
+            names = extract_founders(founder_content, company_name)
+            _record('founder_source', 'rules' if names else 'llm')
+            if names:
+                return names
+
+            # Use AI to extract founder names from search results
+            prompt = f"""
+            Based on the following search results about {company_name}, identify the founders or co-founders of the company.
+
+            Extract the FULL NAMES (first and last name) of people who founded the company.
+            Return ONLY the complete names, one per line, without titles or additional text.
+            If you find a first name, try to find the corresponding last name in the content.
+            If no clear founder names are found, return "No founders identified".
+
+            Examples of good responses:
+            - "John Smith"
+            - "Jane Doe"
+            - "Robert Johnson"
+
+            Examples of bad responses:
+            - "John" (incomplete)
+            - "CEO Smith" (contains title)
+            - "The founder" (not a name)
+
+            Search Results:
+            {founder_content}
+
+            Complete founder names only:
+            """
+
+            response = await self.llm.complete_task(
+                'founders',
+                messages=[
+                    {"role": "system", "content": "You are extracting complete founder names from search results. Always return full names (first and last name together), never just first names."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=256,
+                temperature=0.3,
+                use_cache=use_cache
+            )
+
+            if "No founders identified" in response:
+                return []
+
+            # Parse names from response
+            names = [name.strip() for name in response.split('\n') if name.strip() and len(name.strip()) > 2]
+            return filter_founder_names(names)
+
+        except Exception as e:
+            return []
+
+    async def _search_google_for_founders(self, query: str) -> Optional[str]:
+        """
+        Search Google and try to extract content including AI Overview
+        """
+        try:
+            # Use Google search with specific headers
+            google_headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive',
+            }
+
+            google_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
+
+            response = await self.transport.get(google_url, headers=google_headers, timeout=10)
+
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.content, 'html.parser')
+
+                # Look for AI Overview content (multiple possible selectors)
+                ai_overview_selectors = [
+                    '[data-attrid="kc:/local:one line description"]',
+                    '[data-attrid="description"]',
+                    'div[data-md]',
+                    '.kno-rdesc',
+                    '.kno-desc',
+                    '.LGOjhe',
+                    'div[data-async-context]'
+                ]
+
+                content = ""
+
+                # Try to find AI Overview or knowledge panel content
+                for selector in ai_overview_selectors:
+                    elements = soup.select(selector)
+                    for element in elements:
+                        text = element.get_text().strip()
+                        if text and len(text) > 20 and query.split()[0].lower() in text.lower():
+                            content += text + " "
+
+                # Also look in general search result snippets
+                if not content:
+                    result_snippets = soup.find_all(['span', 'div'], class_=re.compile(r'st|s3v9rd|VwiC3b'))
+                    for snippet in result_snippets[:3]:
+                        text = snippet.get_text().strip()
+                        if text and len(text) > 20:
+                            content += text + " "
+
+                # Look for any div that contains the company name and "founder"
+                if not content:
+                    all_divs = soup.find_all(['div', 'span', 'p'])
+                    for div in all_divs:
+                        text = div.get_text().strip()
+                        if (query.split()[0].lower() in text.lower() and
+                            'founder' in text.lower() and
+                            len(text) > 30 and len(text) < 500):
+                            content += text + " "
+                            break
+
+                return content.strip() if content.strip() else None
+
+            return None
+
+        except Exception as e:
+            print(f"Error searching Google for founders: {e}")
+            return None
+
+    async def _search_duckduckgo_for_founders(self, query: str) -> Optional[str]:
+        """
+        Search for founder information using DuckDuckGo
+        """
+        try:
+            ddg_url = f"https://html.duckduckgo.com/html/?q={query.replace(' ', '+')}"
+
+            response = await self.transport.get(ddg_url, timeout=10)
+            soup = BeautifulSoup(response.content, 'html.parser')
+
+            # Look for instant answer or snippet content first
+            instant_answer = soup.find('div', class_='zci')
+            if instant_answer:
+                text = instant_answer.get_text().strip()
+                if text and len(text) > 20:
+                    return text
+
+            # Fetch the first 2 results concurrently, keep the first usable one
+            urls = [result.get('href') for result in soup.find_all('a', class_='result__a')[:2] if result.get('href')]
+            page_texts = await asyncio.gather(*(self._fetch_paragraph_text(url) for url in urls))
+
+            for page_text in page_texts:
+                if page_text and len(page_text) > 50:
+                    return page_text
+
+            return None
+
+        except Exception as e:
+            print(f"Error searching DuckDuckGo for founders: {e}")
+            return None
+
+    async def _fetch_paragraph_text(self, url: str) -> str:
+        """
+        Fetch a page and return the text of its first paragraphs
+        """
+        try:
+            page_response = await self.transport.fetch_text(url, max_bytes=self.max_page_bytes, timeout=8)
+            if page_response is None:
+                return ''
+            page_soup = BeautifulSoup(page_response.text, 'html.parser')
+
+            # Remove scripts and styles
+            for script in page_soup(["script", "style"]):
+                script.decompose()
+
+            # Get text content, focusing on paragraphs
+            paragraphs = page_soup.find_all('p')
+            return ' '.join([p.get_text().strip() for p in paragraphs[:5]])
+        except Exception:
+            return ''
+
+    @tracked('analysis')
+    async def analyze_with_llm(self, company_name: str, website_content: Dict[str, str],
+                               use_cache: bool = True) -> str:
+        """
+        Use Llama via Groq to analyze website content and generate company summary
+
+        The content is compacted to analysis_token_budget first; the
+        before/after token estimate is recorded for the running research
+        call and ends up in research_company's result.
+        """
+        try:
+            website_content, report = compact_website_content(website_content, self.analysis_token_budget)
+            _record('prompt_tokens', report)
+
+            content_text = f"""
+            Company: {company_name}
+            Website Title: {website_content.get('title', '')}
+            Meta Description: {website_content.get('description', '')}
+            About Section: {website_content.get('about', '')}
+            Products/Services: {website_content.get('products', '')}
+            Main Content: {website_content.get('main_content', '')}
+            """
+
+            prompt = f"""
+            Based on the following website content about {company_name}, provide a comprehensive analysis in the following format:
+
+            **Company Overview:**
+            [2-3 sentences describing what the company does, their mission, and their position in the market]
+
+            **Key Products/Services:**
+            [List the main products or services offered, with brief descriptions]
+
+            **Industry & Focus:**
+            [What industry they operate in and their main focus areas]
+
+            **Company Culture & Values:**
+            [Any insights about their culture, values, or approach to business]
+
+            **Recent Developments:**
+            [Any notable achievements, growth, or recent developments mentioned]
+
+            Website Content:
+            {content_text}
+
+            Keep the analysis professional, accurate, and focused on information that would be valuable for tailoring a cover letter.
+            """
+
+            return await self.llm.complete_task(
+                'analysis',
+                messages=[
+                    {"role": "system", "content": "You are a professional research assistant helping someone research companies for job applications."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1024,
+                temperature=0.7,
+                use_cache=use_cache
+            )
+
+        except Exception as e:
+            return f"Error occurred during analysis: {str(e)}"
+
+
+class _LoopThread:
+    """
+    Background event loop that lets blocking callers run coroutines.
+
+    One loop is shared by the whole process so pooled connections created by
+    one call are still usable by the next.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._loop.run_forever, name="research-loop", daemon=True)
+                thread.start()
+            return self._loop
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+
+_BACKGROUND_LOOP = _LoopThread()
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared background loop and wait for its result"""
+    return _BACKGROUND_LOOP.run(coro)
+
+
+def iterate_sync(agen):
+    """Iterate an async generator on the shared background loop from blocking code"""
+    try:
+        while True:
+            try:
+                yield run_sync(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        run_sync(agen.aclose())
@@ -0,0 +1,266 @@
+"""
+Headless batch research over a CSV or JSONL list of companies.
+
+Each input row needs a company name (column/key `company_name` or `company`)
+and may carry a job description (`jd_text` or `jd`). Results are appended to
+a JSONL file as soon as each company finishes, in the same shape as
+testing/fincepta_research.json plus `founders`. The output file doubles as
+the checkpoint: rerunning the same command skips companies already written
+(add --retry-failed to research again the ones that ended with an error).
+
+With --resume, rows are ranked by how well their JD matches the resume
+(jd_matcher.py) and researched best fit first; --min-score skips weak fits.
+--verbose logs every research stage with its time, bytes and tokens, and
+--events appends the raw progress events to a JSONL file.
+
+Usage:
+    python batch_research.py companies.csv -o results.jsonl --concurrency 16
+    python batch_research.py companies.csv --resume resume.pdf --min-score 0.2
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from async_research import AsyncCompanyResearcher
+from cache_store import DomainCache, HttpCache, LLMCache, ResumeCache
+from jd_matcher import score_jds
+from progress import STARTED, format_event
+from rate_limit import BATCH
+from resume_parser import ingest_resume
+
+
+NAME_COLUMNS = ("company_name", "company")
+
+
+def read_companies(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Yield {'company_name', 'jd_text'} rows from a CSV or JSONL file.
+
+    A UTF-8 byte order mark (Excel adds one) is ignored. Raises ValueError
+    when the CSV header or a JSONL record has no company name column.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+            if not any(column in (rows.fieldnames or ()) for column in NAME_COLUMNS):
+                raise ValueError(f"{path} has no company_name or company column "
+                                 f"(columns: {', '.join(rows.fieldnames or []) or 'none'})")
+
+        for number, row in enumerate(rows, 1):
+            if not any(column in row for column in NAME_COLUMNS):
+                raise ValueError(f"{path}: record {number} has no company_name or company key")
+            company_name = (row.get("company_name") or row.get("company") or "").strip()
+            if not company_name:
+                continue
+            yield {
+                "company_name": company_name,
+                "jd_text": (row.get("jd_text") or row.get("jd") or "").strip(),
+            }
+
+
+def row_key(company_name: str, jd_text: str = "") -> str:
+    """Stable identity of an input row, used to skip finished work on resume"""
+    digest = hashlib.sha1(jd_text.encode("utf-8")).hexdigest()[:12]
+    return f"{DomainCache.normalize(company_name)}|{digest}"
+
+
+def load_checkpoint(output_path: str, retry_failed: bool = False) -> Set[str]:
+    """
+    Return the keys already present in the output file.
+
+    With retry_failed, records that carry an error are not counted as done.
+    A partially written last line (from a crash mid-write) is truncated so
+    appends continue from a clean record boundary.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    valid_bytes = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not (retry_failed and record.get("error")):
+                done.add(row_key(record.get("company_name", ""), record.get("jd_text", "")))
+            valid_bytes += len(line)
+
+    if valid_bytes != os.path.getsize(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(valid_bytes)
+    return done
+
+
+def prioritize_rows(rows: List[Dict[str, str]], resume_text: str, min_score: float = 0.0) -> List[Dict[str, str]]:
+    """
+    Rows ordered by JD match score, best first, with the score under
+    'match_score'. Rows without a JD keep their order at the end; scored
+    rows below min_score are dropped.
+    """
+    with_jd = [row for row in rows if row["jd_text"]]
+    without_jd = [row for row in rows if not row["jd_text"]]
+    if not with_jd:
+        return rows
+
+    scores = score_jds(resume_text, [row["jd_text"] for row in with_jd])["score"]
+    ranked = []
+    for index in (-scores).argsort(kind="stable").tolist():
+        if scores[index] < min_score:
+            break
+        ranked.append(dict(with_jd[index], match_score=round(float(scores[index]), 4)))
+    return ranked + without_jd
+
+
+async def run_batch(rows: List[Dict[str, str]], output_path: str, groq_api_key: str,
+                    concurrency: int = 8, crawl: bool = False, log=print,
+                    progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Research rows with at most `concurrency` companies in flight, appending
+    each result to output_path as soon as it is ready. progress receives
+    every stage event of every company (see progress.py).
+    """
+    researcher = AsyncCompanyResearcher(
+        groq_api_key,
+        domain_cache=DomainCache(),
+        http_cache=HttpCache(),
+        llm_cache=LLMCache(),
+        llm_priority=BATCH,
+        max_concurrent_companies=concurrency,
+        progress_handler=progress,
+    )
+    queue = asyncio.Queue()
+    for row in rows:
+        queue.put_nowait(row)
+
+    counts = {"done": 0, "failed": 0, "total": len(rows), "founders": {"rules": 0, "llm": 0}}
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        async def worker():
+            while True:
+                try:
+                    row = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                start = time.perf_counter()
+                try:
+                    result = await researcher.research_company(row["company_name"], crawl)
+                except Exception as e:
+                    result = {"company_name": row["company_name"], "error": str(e)}
+                if row["jd_text"]:
+                    result["jd_text"] = row["jd_text"]
+                if "match_score" in row:
+                    result["match_score"] = row["match_score"]
+
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+
+                counts["done"] += 1
+                if result.get("founder_source"):
+                    counts["founders"][result["founder_source"]] += 1
+                if result.get("error"):
+                    counts["failed"] += 1
+                status = result.get("error") or result.get("website_url")
+                log(f"[{counts['done']}/{counts['total']}] {row['company_name']}: "
+                    f"{status} ({time.perf_counter() - start:.1f}s)")
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            counts["http_cache"] = researcher.connection_stats()["cache"]
+            counts["llm_cache"] = researcher.llm_cache_stats()
+            counts["scheduler"] = researcher.scheduler_stats()
+            counts["router"] = researcher.router_stats()
+            await researcher.aclose()
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Research many companies without the Streamlit UI")
+    parser.add_argument("input", help="CSV or JSONL file with company_name and optional jd_text")
+    parser.add_argument("-o", "--output", default="research_results.jsonl", help="JSONL file to append results to")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="companies researched in parallel")
+    parser.add_argument("--crawl", action="store_true", help="also read linked about/team/product pages")
+    parser.add_argument("--retry-failed", action="store_true", help="research again companies whose earlier result has an error")
+    parser.add_argument("--resume", help="PDF resume; research the best-matching JDs first")
+    parser.add_argument("--min-score", type=float, default=0.0, help="with --resume, skip JDs scoring below this (0-1)")
+    parser.add_argument("--events", help="append every progress event to this JSONL file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log each research stage as it finishes")
+    parser.add_argument("--groq-api-key", default=os.environ.get("GROQ_API_KEY"), help="defaults to $GROQ_API_KEY")
+    args = parser.parse_args(argv)
+
+    if not args.groq_api_key:
+        parser.error("a Groq API key is required (--groq-api-key or GROQ_API_KEY)")
+
+    done = load_checkpoint(args.output, args.retry_failed)
+    rows, seen = [], set(done)
+    try:
+        for row in read_companies(args.input):
+            key = row_key(row["company_name"], row["jd_text"])
+            if key not in seen:
+                seen.add(key)
+                rows.append(row)
+    except ValueError as e:
+        parser.error(str(e))
+
+    log = lambda message: print(message, file=sys.stderr)
+    if args.resume:
+        with open(args.resume, "rb") as f:
+            resume = ingest_resume(f.read(), ResumeCache())
+        start = time.perf_counter()
+        ranked = prioritize_rows(rows, resume["text"], args.min_score)
+        log(f"Ranked {len(rows)} rows against the resume in {time.perf_counter() - start:.2f}s"
+            f"{f', skipped {len(rows) - len(ranked)} below {args.min_score}' if len(ranked) < len(rows) else ''}")
+        rows = ranked
+    log(f"{len(done)} companies already done, {len(rows)} to research")
+    events_file = open(args.events, "a", encoding="utf-8") if args.events else None
+
+    def progress(event):
+        if events_file is not None:
+            events_file.write(json.dumps(dict(event, at=time.time()), ensure_ascii=False) + "\n")
+        if args.verbose and event["status"] != STARTED:
+            log(format_event(event))
+
+    try:
+        counts = asyncio.run(run_batch(rows, args.output, args.groq_api_key, args.concurrency, args.crawl, log,
+                                       progress if events_file is not None or args.verbose else None))
+    finally:
+        if events_file is not None:
+            events_file.close()
+    log(f"Finished {counts['done']} companies ({counts['failed']} with errors) -> {args.output}")
+    cache = counts.get("http_cache")
+    if cache:
+        log(f"Page cache: {cache['hits']} fresh hits, {cache['revalidations']} revalidated, "
+            f"{cache['misses']} downloaded, {cache['bytes_saved'] / 1024:.0f} KB saved")
+    cache = counts.get("llm_cache")
+    if cache:
+        log(f"LLM cache: {cache['hit_rate']:.0%} hit rate ({cache['hits']} hits, {cache['misses']} misses)")
+    scheduler = counts.get("scheduler")
+    if scheduler:
+        lane = scheduler["lanes"]["batch"]
+        log(f"Groq scheduler: {lane['requests']} requests, {lane['avg_wait']:.1f}s average wait "
+            f"({lane['max_wait']:.1f}s max), {scheduler['rate_limited']} rate limited, {scheduler['retries']} retried")
+    founders = counts.get("founders")
+    if founders and founders["rules"] + founders["llm"]:
+        log(f"Founder search: {founders['rules']} answered by rules, {founders['llm']} by the LLM "
+            f"({founders['rules'] / (founders['rules'] + founders['llm']):.0%} of LLM calls avoided)")
+    for task, stats in (counts.get("router") or {}).items():
+        latencies = ", ".join(f"{model} {model_stats['avg_latency']:.1f}s x{model_stats['calls']}"
+                              for model, model_stats in stats["models"].items())
+        log(f"Model router [{task}]: {stats['calls']} calls, {stats['escalation_rate']:.0%} escalated ({latencies})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Shared on-disk location for all persistent caches; point several app
+# instances at the same directory to share results between them
+CACHE_DIR = os.environ.get(
+    "COLD_OUTREACH_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "cold_outreach")
+)
+
+
+class SQLiteCache:
+    """
+    Small persistent key/value store with per-entry TTL and LRU eviction.
+
+    Values must be JSON-serializable. Storage errors never propagate: a broken
+    or read-only cache file simply behaves like an empty cache.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " expires_at REAL,"
+                    " last_access REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        except (sqlite3.Error, OSError) as e:
+            print(f"Cache unavailable at {path}: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value for key, or None if missing or expired
+        """
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                if row[1] is not None and row[1] <= now:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError):
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store value under key, expiring after ttl seconds (never if None)
+        """
+        now = time.time()
+        payload = json.dumps(value)
+        expires_at = now + ttl if ttl is not None else None
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, expires_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload.encode("utf-8")), expires_at, now)
+                )
+                self._evict(conn, now)
+        except sqlite3.Error:
+            pass
+
+    def delete(self, key: str):
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM entries")
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters for this instance plus current on-disk usage
+        """
+        entries, total_bytes = 0, 0
+        try:
+            with self._connect() as conn:
+                entries, total_bytes = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+        except sqlite3.Error:
+            pass
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': total_bytes,
+        }
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """
+        Drop expired entries, then least recently used ones until within limits
+        """
+        conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+        if self.max_entries is not None:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+        if self.max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    total -= size
+
+
+class DomainCache:
+    """
+    Persistent mapping from normalized company name to resolved website.
+
+    Names whose search completed without finding a site are cached as
+    negative entries with a shorter TTL, since a site may appear later.
+    Callers must not store a negative entry for a search that failed.
+    """
+
+    LEGAL_SUFFIXES = re.compile(r'\b(inc|llc|ltd|limited|corp|corporation|co|gmbh|plc|pvt)\b')
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 6 * 3600, max_entries: int = 10000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.store = SQLiteCache(path or os.path.join(CACHE_DIR, "domains.sqlite3"), max_entries=max_entries)
+
+    @classmethod
+    def normalize(cls, company_name: str) -> str:
+        """
+        Normalize a company name so trivial spelling variants share an entry
+        """
+        name = re.sub(r'[^a-z0-9 ]+', ' ', company_name.lower())
+        name = cls.LEGAL_SUFFIXES.sub(' ', name)
+        return ' '.join(name.split())
+
+    def get(self, company_name: str) -> Tuple[bool, Optional[str]]:
+        """
+        Return (found, website); website is None for a cached negative entry
+        """
+        key = self.normalize(company_name)
+        if not key:
+            return False, None
+        entry = self.store.get(key)
+        if entry is None:
+            return False, None
+        return True, entry.get('website')
+
+    def set(self, company_name: str, website: Optional[str]):
+        key = self.normalize(company_name)
+        if not key:
+            return
+        ttl = self.ttl if website else self.negative_ttl
+        self.store.set(key, {'website': website}, ttl=ttl)
+
+    def stats(self) -> dict:
+        return self.store.stats()
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpCache:
+    """
+    Persistent cache of fetched pages following HTTP caching rules (RFC 9111).
+
+    Fresh entries are served without touching the network; stale ones that
+    carry an ETag or Last-Modified are revalidated with a conditional request.
+    Bodies are evicted least recently used first once max_bytes is exceeded.
+    """
+
+    # Heuristic freshness for responses with only Last-Modified: 10% of the
+    # document's age, capped at a day
+    HEURISTIC_FRACTION = 0.1
+    MAX_HEURISTIC_LIFETIME = 24 * 3600
+    CACHEABLE_STATUSES = (200, 203)
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 200 * 1024 * 1024,
+                 retention: float = 30 * 24 * 3600):
+        self.retention = retention
+        self.store = SQLiteCache(path or os.path.join(CACHE_DIR, "http.sqlite3"), max_bytes=max_bytes)
+        # Counters are updated from the worker threads running refresh()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.bytes_saved = 0
+
+    def freshness_lifetime(self, headers) -> Optional[float]:
+        """
+        Seconds a response stays fresh, 0 if it must always be revalidated,
+        or None if it must not be stored at all
+        """
+        directives = _parse_cache_control(headers.get('cache-control', ''))
+        if 'no-store' in directives:
+            return None
+        vary = headers.get('vary', '')
+        if vary and any(field.strip().lower() != 'accept-encoding' for field in vary.split(',')):
+            return None
+        if 'no-cache' in directives:
+            return 0
+
+        age = 0.0
+        try:
+            age = float(headers.get('age', 0))
+        except ValueError:
+            pass
+
+        if directives.get('max-age') is not None:
+            try:
+                return max(int(directives['max-age']) - age, 0)
+            except ValueError:
+                return 0
+
+        date = _parse_http_date(headers.get('date')) or time.time()
+        expires = _parse_http_date(headers.get('expires'))
+        if headers.get('expires') is not None:
+            return max(expires - date, 0) if expires is not None else 0
+
+        last_modified = _parse_http_date(headers.get('last-modified'))
+        if last_modified is not None:
+            return min(max(date - last_modified, 0) * self.HEURISTIC_FRACTION, self.MAX_HEURISTIC_LIFETIME)
+        return 0
+
+    def lookup(self, url: str) -> Optional[dict]:
+        return self.store.get(url)
+
+    def is_fresh(self, entry: dict) -> bool:
+        return entry['fresh_until'] > time.time()
+
+    def conditional_headers(self, entry: dict) -> Dict[str, str]:
+        headers = {}
+        if entry['headers'].get('etag'):
+            headers['If-None-Match'] = entry['headers']['etag']
+        if entry['headers'].get('last-modified'):
+            headers['If-Modified-Since'] = entry['headers']['last-modified']
+        return headers
+
+    def record_hit(self, entry: dict):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += entry['bytes_read']
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def store_response(self, url: str, final_url: str, status_code: int, headers, text: str, bytes_read: int):
+        """
+        Store a freshly downloaded page if its status and headers allow it
+        """
+        if status_code not in self.CACHEABLE_STATUSES:
+            return
+        lifetime = self.freshness_lifetime(headers)
+        if lifetime is None:
+            return
+        kept = {name: headers.get(name) for name in ('etag', 'last-modified', 'cache-control', 'expires', 'date', 'content-type')
+                if headers.get(name) is not None}
+        # Nothing to gain from an entry that is never fresh and cannot be revalidated
+        if lifetime <= 0 and 'etag' not in kept and 'last-modified' not in kept:
+            return
+        self.store.set(url, {
+            'url': final_url,
+            'status_code': status_code,
+            'headers': kept,
+            'text': text,
+            'bytes_read': bytes_read,
+            'fresh_until': time.time() + lifetime,
+        }, ttl=self.retention)
+
+    def refresh(self, url: str, entry: dict, headers) -> dict:
+        """
+        Apply a 304 Not Modified: merge its headers and restart freshness
+        """
+        with self._lock:
+            self.revalidations += 1
+            self.bytes_saved += entry['bytes_read']
+        for name in ('etag', 'last-modified', 'cache-control', 'expires', 'date'):
+            if headers.get(name) is not None:
+                entry['headers'][name] = headers.get(name)
+        lifetime = self.freshness_lifetime(entry['headers']) or 0
+        entry['fresh_until'] = time.time() + lifetime
+        self.store.set(url, entry, ttl=self.retention)
+        return entry
+
+    def stats(self) -> dict:
+        stored = self.store.stats()
+        lookups = self.hits + self.misses + self.revalidations
+        return {
+            'hits': self.hits,
+            'revalidations': self.revalidations,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.revalidations) / lookups if lookups else 0.0,
+            'bytes_saved': self.bytes_saved,
+            'entries': stored['entries'],
+            'bytes': stored['bytes'],
+        }
+
+
+class LLMCache:
+    """
+    Persistent cache of chat completions addressed by their exact request.
+
+    The key is a hash of model, messages, temperature and max_tokens, so any
+    change to the prompt or parameters is a different entry. Entries expire
+    after ttl seconds and the least recently used go first once max_bytes
+    is exceeded.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.ttl = ttl
+        self.store = SQLiteCache(path or os.path.join(CACHE_DIR, "llm.sqlite3"), max_bytes=max_bytes)
+        self.bypassed = 0
+
+    @staticmethod
+    def key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        payload = json.dumps(
+            {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens},
+            sort_keys=True, separators=(',', ':'), ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.store.get(key)
+        return entry['content'] if entry is not None else None
+
+    def set(self, key: str, content: str):
+        self.store.set(key, {'content': content}, ttl=self.ttl)
+
+    def record_bypass(self):
+        self.bypassed += 1
+
+    def stats(self) -> dict:
+        stats = self.store.stats()
+        stats['bypassed'] = self.bypassed
+        return stats
+
+
+class ResumeCache:
+    """
+    Persistent cache of parsed resumes keyed by a hash of the file bytes.
+
+    Resumes rarely change, so entries never expire; the least recently used
+    are evicted beyond max_entries or max_bytes.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 200, max_bytes: int = 20 * 1024 * 1024):
+        self.store = SQLiteCache(path or os.path.join(CACHE_DIR, "resumes.sqlite3"),
+                                 max_entries=max_entries, max_bytes=max_bytes)
+
+    @staticmethod
+    def key(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.store.get(key)
+
+    def set(self, key: str, parsed: dict):
+        self.store.set(key, parsed)
+
+    def stats(self) -> dict:
+        return self.store.stats()
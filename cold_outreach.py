@@ -1,570 +1,304 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from groq import Groq
+import asyncio
 import time
 import re
-from urllib.parse import urljoin, urlparse
-import json
-import tempfile
 from typing import Optional, Dict, List
-import pdfplumber
-from docx import Document
-import os
-import base64
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-import pickle
-
-# Gmail API Scopes
-SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+from google.auth.exceptions import RefreshError
+from async_research import AsyncCompanyResearcher, collect_errors, iterate_sync, run_sync
+from cache_store import DomainCache, HttpCache, LLMCache, ResumeCache
+from email_parser import parse_email
+from gmail_client import GmailClient
+from llm_client import GroqChat
+from network import HostResolver, HttpTransport
+from progress import FINISHED, STARTED
+from rate_limit import SHARED_SCHEDULER
+from jd_matcher import rank_jds
+from resume_parser import ingest_resume, select_resume_sections
+from template_registry import EMAIL, PROMPT, SHARED_TEMPLATES, TemplateError
+
+def show_errors(errors: List[str]):
+    """Show the errors one research call reported"""
+    for message in errors:
+        st.error(message)
 
 class CompanyResearcher:
-    def __init__(self, groq_api_key: str):
+    """
+    Blocking facade over AsyncCompanyResearcher for the Streamlit app.
+
+    Every call runs on a shared background event loop, so pooled connections
+    survive between calls and across researcher instances. Errors reported
+    by the engine are collected per call and shown with st.error from the
+    calling script thread, since Streamlit cannot render from the loop
+    thread. Nothing call-specific is kept on the instance, so one cached
+    researcher can serve every session.
+    """
+    def __init__(self, groq_api_key: str, probe_workers: int = 6,
+                 domain_cache: Optional[DomainCache] = None,
+                 resolver: Optional[HostResolver] = None,
+                 transport: Optional[HttpTransport] = None,
+                 http_cache: Optional[HttpCache] = None,
+                 llm_cache: Optional[LLMCache] = None):
         """
         Initialize the Company Researcher with Groq API key for Llama models
+
+        Arguments are passed through to AsyncCompanyResearcher.
         """
+        self.engine = AsyncCompanyResearcher(
+            groq_api_key,
+            probe_workers=probe_workers,
+            domain_cache=domain_cache,
+            resolver=resolver,
+            transport=transport,
+            http_cache=http_cache,
+            llm_cache=llm_cache,
+        )
         self.groq_api_key = groq_api_key
-        self.groq_client = Groq(api_key=groq_api_key)
-        
-        # Headers to avoid being blocked
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
     
-    def search_company_website(self, company_name: str) -> Optional[str]:
+    def _run(self, coro):
+        errors = []
+        try:
+            return run_sync(collect_errors(coro, errors.append))
+        finally:
+            show_errors(errors)
+    
+    def connection_stats(self) -> dict:
         """
-        Search for company website using multiple methods
+        Connection reuse counters of the underlying HTTP transport
         """
-        # Method 1: Try common domain patterns first
-        website = self._try_common_domains(company_name)
-        if website:
-            return website
-        
-        # Method 2: Try DuckDuckGo search
-        website = self._search_duckduckgo(company_name)
-        if website:
-            return website
-        
-        return None
+        return self.engine.connection_stats()
     
-    def _try_common_domains(self, company_name: str) -> Optional[str]:
+    def research_company(self, company_name: str, crawl: bool = False) -> Dict:
         """
-        Try common domain patterns for the company
+        Research website, analysis and founders with the stages running concurrently
         """
-        clean_name = company_name.lower().replace(' ', '').replace('.', '').replace(',', '').replace('-', '')
-        
-        patterns = [
-            f"https://www.{clean_name}.com",
-            f"https://{clean_name}.com",
-            f"https://www.{clean_name}.ai",
-            f"https://{clean_name}.ai",
-            f"https://www.{clean_name}.io",
-            f"https://{clean_name}.io",
-            f"https://www.{clean_name}.co",
-            f"https://{clean_name}.co",
-        ]
-        
-        hyphen_name = company_name.lower().replace(' ', '-').replace('.', '').replace(',', '')
-        patterns.extend([
-            f"https://www.{hyphen_name}.com",
-            f"https://{hyphen_name}.com",
-            f"https://www.{hyphen_name}.ai",
-            f"https://{hyphen_name}.ai",
-            f"https://www.{hyphen_name}.io",
-            f"https://{hyphen_name}.io",
-        ])
-        
-        for pattern in patterns:
-            try:
-                response = requests.head(pattern, headers=self.headers, timeout=5, allow_redirects=True)
-                if response.status_code == 200:
-                    return pattern
-            except:
-                continue
-        
-        return None
+        errors = []
+        try:
+            return run_sync(self.engine.research_company(company_name, crawl, errors=errors.append))
+        finally:
+            show_errors(errors)
     
-    def _search_duckduckgo(self, company_name: str) -> Optional[str]:
+    def research_events(self, company_name: str, crawl: bool = False):
         """
-        Search using DuckDuckGo
+        research_company, yielding progress events as each stage starts and
+        finishes; the last event carries the result dict under 'result'
         """
+        errors = []
         try:
-            search_query = f"{company_name} official website"
-            ddg_url = f"https://html.duckduckgo.com/html/?q={search_query.replace(' ', '+')}"
-            
-            response = requests.get(ddg_url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            links = soup.find_all('a', class_='result__a')
-            
-            for link in links[:5]:
-                if link.get('href'):
-                    url = link.get('href')
-                    if self._is_likely_company_website(url, company_name):
-                        try:
-                            test_response = requests.head(url, headers=self.headers, timeout=5)
-                            if test_response.status_code == 200:
-                                return url
-                        except:
-                            continue
-            
-            return None
-            
-        except Exception as e:
-            st.error(f"DuckDuckGo search error: {e}")
-            return None
+            yield from iterate_sync(self.engine.research_events(company_name, crawl, errors=errors.append))
+        finally:
+            show_errors(errors)
     
-    def _is_likely_company_website(self, url: str, company_name: str) -> bool:
+    def search_company_website(self, company_name: str) -> Optional[str]:
         """
-        Check if URL is likely the company's official website
+        Search for company website using multiple methods
         """
-        excluded_domains = [
-            'linkedin.com', 'facebook.com', 'twitter.com', 'instagram.com',
-            'glassdoor.com', 'indeed.com', 'crunchbase.com', 'wikipedia.org',
-            'youtube.com', 'bloomberg.com', 'reuters.com', 'techcrunch.com'
-        ]
-        
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        
-        for excluded in excluded_domains:
-            if excluded in domain:
-                return False
-        
-        company_words = company_name.lower().split()
-        for word in company_words:
-            if len(word) > 3 and word in domain:
-                return True
-        
-        return True
+        return self._run(self.engine.search_company_website(company_name))
     
-    def scrape_website_content(self, url: str) -> Dict[str, str]:
+    def scrape_website_content(self, url: str, crawl: bool = False) -> Dict[str, str]:
         """
         Scrape and extract relevant content from company website
         """
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-            
-            content = {
-                'title': '',
-                'description': '',
-                'about': '',
-                'products': '',
-                'main_content': ''
-            }
-            
-            title_tag = soup.find('title')
-            if title_tag:
-                content['title'] = title_tag.get_text().strip()
-            
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                content['description'] = meta_desc.get('content', '').strip()
-            
-            about_sections = soup.find_all(['section', 'div'], 
-                                         class_=re.compile(r'about|mission|vision|story', re.I))
-            about_text = []
-            for section in about_sections:
-                text = section.get_text().strip()
-                if len(text) > 50:
-                    about_text.append(text)
-            content['about'] = ' '.join(about_text[:3])
-            
-            product_sections = soup.find_all(['section', 'div'], 
-                                           class_=re.compile(r'product|service|solution|feature', re.I))
-            product_text = []
-            for section in product_sections:
-                text = section.get_text().strip()
-                if len(text) > 30:
-                    product_text.append(text)
-            content['products'] = ' '.join(product_text[:3])
-            
-            paragraphs = soup.find_all('p')
-            main_text = []
-            for p in paragraphs:
-                text = p.get_text().strip()
-                if len(text) > 20:
-                    main_text.append(text)
-            content['main_content'] = ' '.join(main_text[:10])
-            
-            return content
-            
-        except Exception as e:
-            st.error(f"Error scraping website: {e}")
-            return {}
+        return self._run(self.engine.scrape_website_content(url, crawl))
     
-    def find_founders(self, company_name: str) -> List[str]:
+    def find_founders(self, company_name: str, use_cache: bool = True) -> List[str]:
         """
         Search for founder names using multiple search approaches
         """
-        try:
-            # Try Google first (for AI Overview content)
-            search_query = f"{company_name} founder"
-            founder_content = self._search_google_for_founders(search_query)
-            
-            # If Google fails, try DuckDuckGo
-            if not founder_content:
-                founder_content = self._search_duckduckgo_for_founders(search_query)
-            
-            if not founder_content:
-                return []
-            
-            # Use AI to extract founder names from search results
-            prompt = f"""
-            Based on the following search results about {company_name}, identify the founders or co-founders of the company.
-            
-            Extract the FULL NAMES (first and last name) of people who founded the company. 
-            Return ONLY the complete names, one per line, without titles or additional text.
-            If you find a first name, try to find the corresponding last name in the content.
-            If no clear founder names are found, return "No founders identified".
-            
-            Examples of good responses:
-            - "John Smith"
-            - "Jane Doe"
-            - "Robert Johnson"
-            
-            Examples of bad responses:
-            - "John" (incomplete)
-            - "CEO Smith" (contains title)
-            - "The founder" (not a name)
-            
-            Search Results:
-            {founder_content}
-            
-            Complete founder names only:
-            """
-            
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are extracting complete founder names from search results. Always return full names (first and last name together), never just first names."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="llama3-70b-8192",
-                max_tokens=256,
-                temperature=0.3
-            )
-            
-            response = chat_completion.choices[0].message.content.strip()
-            
-            if "No founders identified" in response:
-                return []
-            
-            # Parse names from response
-            names = [name.strip() for name in response.split('\n') if name.strip() and len(name.strip()) > 2]
-            
-            # More lenient filtering - accept single names if they're reasonable length
-            filtered_names = []
-            for name in names:
-                # Skip if contains common non-name words
-                if any(word in name.lower() for word in ['team', 'company', 'founded', 'the', 'inc', 'llc', 'ltd', 'corporation', 'group']):
-                    continue
-                
-                # Remove any titles
-                clean_name = re.sub(r'\b(CEO|CTO|CFO|COO|President|Director|Mr\.|Ms\.|Dr\.|Prof\.)\b', '', name, flags=re.IGNORECASE).strip()
-                
-                if clean_name and len(clean_name) > 2:
-                    # Prefer full names (first + last) but accept reasonable single names too
-                    if ' ' in clean_name:
-                        # Full name - preferred
-                        filtered_names.append(clean_name)
-                    elif len(clean_name) >= 4 and clean_name.isalpha():
-                        # Single name but reasonable length and all letters
-                        filtered_names.append(clean_name)
-            
-            return filtered_names
-            
-        except Exception as e:
-            return []
+        return self._run(self.engine.find_founders(company_name, use_cache))
     
-    def _search_google_for_founders(self, query: str) -> Optional[str]:
+    def analyze_with_llm(self, company_name: str, website_content: Dict[str, str], use_cache: bool = True) -> str:
         """
-        Search Google and try to extract content including AI Overview
+        Use Llama via Groq to analyze website content and generate company summary
         """
-        try:
-            # Use Google search with specific headers
-            google_headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            google_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            
-            response = requests.get(google_url, headers=google_headers, timeout=10)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for AI Overview content (multiple possible selectors)
-                ai_overview_selectors = [
-                    '[data-attrid="kc:/local:one line description"]',
-                    '[data-attrid="description"]',
-                    'div[data-md]',
-                    '.kno-rdesc',
-                    '.kno-desc',
-                    '.LGOjhe',
-                    'div[data-async-context]'
-                ]
-                
-                content = ""
-                
-                # Try to find AI Overview or knowledge panel content
-                for selector in ai_overview_selectors:
-                    elements = soup.select(selector)
-                    for element in elements:
-                        text = element.get_text().strip()
-                        if text and len(text) > 20 and query.split()[0].lower() in text.lower():
-                            content += text + " "
-                
-                # Also look in general search result snippets
-                if not content:
-                    result_snippets = soup.find_all(['span', 'div'], class_=re.compile(r'st|s3v9rd|VwiC3b'))
-                    for snippet in result_snippets[:3]:
-                        text = snippet.get_text().strip()
-                        if text and len(text) > 20:
-                            content += text + " "
-                
-                # Look for any div that contains the company name and "founder"
-                if not content:
-                    all_divs = soup.find_all(['div', 'span', 'p'])
-                    for div in all_divs:
-                        text = div.get_text().strip()
-                        if (query.split()[0].lower() in text.lower() and 
-                            'founder' in text.lower() and 
-                            len(text) > 30 and len(text) < 500):
-                            content += text + " "
-                            break
-                
-                return content.strip() if content.strip() else None
-            
-            return None
-            
-        except Exception as e:
-            print(f"Error searching Google for founders: {e}")
-            return None
+        return self._run(self.engine.analyze_with_llm(company_name, website_content, use_cache))
     
-    def _search_duckduckgo_for_founders(self, query: str) -> Optional[str]:
-        """
-        Search for founder information using DuckDuckGo
-        """
-        try:
-            ddg_url = f"https://html.duckduckgo.com/html/?q={query.replace(' ', '+')}"
-            
-            response = requests.get(ddg_url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for instant answer or snippet content first
-            instant_answer = soup.find('div', class_='zci')
-            if instant_answer:
-                text = instant_answer.get_text().strip()
-                if text and len(text) > 20:
-                    return text
-            
-            # Get first search result content
-            results = soup.find_all('a', class_='result__a')[:2]  # Try first 2 results
-            
-            content = ""
-            for result in results:
-                if result.get('href'):
-                    url = result.get('href')
-                    
-                    try:
-                        # Get the content from this result
-                        page_response = requests.get(url, headers=self.headers, timeout=8)
-                        page_soup = BeautifulSoup(page_response.content, 'html.parser')
-                        
-                        # Remove scripts and styles
-                        for script in page_soup(["script", "style"]):
-                            script.decompose()
-                        
-                        # Get text content, focusing on paragraphs
-                        paragraphs = page_soup.find_all('p')
-                        page_text = ' '.join([p.get_text().strip() for p in paragraphs[:5]])
-                        
-                        if page_text and len(page_text) > 50:
-                            content = page_text
-                            break
-                        
-                    except:
-                        continue
-            
-            return content if content else None
-            
-        except Exception as e:
-            print(f"Error searching DuckDuckGo for founders: {e}")
-            return None
+    def close(self):
+        self._run(self.engine.aclose())
+
+@st.cache_resource
+def shared_caches() -> Dict:
+    """Persistent caches, opened once per process and shared by every session and rerun"""
+    return {
+        'domain': DomainCache(),
+        'http': HttpCache(),
+        'llm': LLMCache(),
+        'resume': ResumeCache(),
+    }
+
+@st.cache_resource
+def shared_researcher(groq_api_key: str) -> CompanyResearcher:
+    """One researcher (and connection pool) per API key, kept across reruns"""
+    caches = shared_caches()
+    return CompanyResearcher(groq_api_key, domain_cache=caches['domain'], http_cache=caches['http'],
+                             llm_cache=caches['llm'])
+
+@st.cache_resource(hash_funcs={LLMCache: lambda cache: cache.store.path})
+def shared_groq_chat(groq_api_key: str, llm_cache: Optional[LLMCache] = None) -> GroqChat:
+    """One Groq client per API key and cache, kept across reruns"""
+    return GroqChat(groq_api_key, cache=llm_cache)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def parsed_email(content: str, default_subject: str):
+    """parse_email, memoized so reruns with the same draft skip the parsing"""
+    return parse_email(content, default_subject)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def email_download_text(subject: str, recipient: str, body: str) -> str:
+    return f"Subject: {subject}\n\nTo: {recipient if recipient else '[Recipient Email]'}\n\nBody:\n{body}"
+
+RESEARCH_STAGES = {
+    'website': ("🔍 Searching for company website...", "✅ Found website"),
+    'scrape': ("🕷️ Scraping website content...", "✅ Website content scraped"),
+    'analysis': ("🤖 Analyzing content with AI...", "✅ AI analysis completed"),
+    'founders': ("👥 Searching for founder information...", "✅ Founder search finished"),
+}
+
+def render_research_event(event: Dict, stage_lines: Dict, container):
+    """Show a progress event as its stage's status line, creating the line on first use"""
+    labels = RESEARCH_STAGES.get(event['stage'])
+    if labels is None:
+        return
+    if event['stage'] not in stage_lines:
+        stage_lines[event['stage']] = container.empty()
+    line = stage_lines[event['stage']]
+    if event['status'] == STARTED:
+        line.info(labels[0])
+        return
     
-    def analyze_with_llm(self, company_name: str, website_content: Dict[str, str]) -> str:
-        """
-        Use Llama via Groq to analyze website content and generate company summary
-        """
-        try:
-            content_text = f"""
-            Company: {company_name}
-            Website Title: {website_content.get('title', '')}
-            Meta Description: {website_content.get('description', '')}
-            About Section: {website_content.get('about', '')}
-            Products/Services: {website_content.get('products', '')}
-            Main Content: {website_content.get('main_content', '')}
-            """
-            
-            prompt = f"""
-            Based on the following website content about {company_name}, provide a comprehensive analysis in the following format:
-
-            **Company Overview:**
-            [2-3 sentences describing what the company does, their mission, and their position in the market]
-
-            **Key Products/Services:**
-            [List the main products or services offered, with brief descriptions]
-
-            **Industry & Focus:**
-            [What industry they operate in and their main focus areas]
-
-            **Company Culture & Values:**
-            [Any insights about their culture, values, or approach to business]
-
-            **Recent Developments:**
-            [Any notable achievements, growth, or recent developments mentioned]
-
-            Website Content:
-            {content_text}
-
-            Keep the analysis professional, accurate, and focused on information that would be valuable for tailoring a cover letter.
-            """
-            
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a professional research assistant helping someone research companies for job applications."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="llama3-70b-8192",
-                max_tokens=1024,
-                temperature=0.7
-            )
-            
-            return chat_completion.choices[0].message.content.strip()
-            
-        except Exception as e:
-            return f"Error occurred during analysis: {str(e)}"
-
-def extract_resume_text(pdf_file):
-    """Extract text from uploaded PDF resume"""
-    text = ''
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + '\n'
-    return text.strip()
-
-def extract_text_from_docx(file):
-    """Extract text from uploaded DOCX file"""
+    facts = [f"{event['elapsed_ms'] / 1000:.1f}s"]
+    if event['bytes']:
+        facts.append(f"{event['bytes'] / 1024:,.0f} KB")
+    if event['tokens']:
+        facts.append(f"{event['tokens']:,} tokens")
+    message = f"{labels[1]} · {' · '.join(facts)}" + (f" — {event['detail']}" if event['detail'] else "")
+    if event['status'] == FINISHED:
+        line.success(message)
+    else:
+        line.error(f"❌ {event['stage'].capitalize()} failed after {facts[0]}")
+
+def read_email_template(template_file) -> str:
+    """Text of an uploaded .txt or .docx email template, parsed once per distinct file"""
     try:
-        doc = Document(file)
-        return "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-    except Exception as e:
-        st.error(f"Error reading DOCX template: {e}")
+        return SHARED_TEMPLATES.parse(template_file.name, template_file.getvalue(), EMAIL)
+    except TemplateError as e:
+        st.warning(f"Could not read email template: {e}")
         return ""
 
-def load_prompt_template(uploaded_template=None):
-    """Load the prompt template for email generation"""
-    default_prompt = """
-    You are an expert cold email writer. Write a professional, compelling cold email for a job application.
-
-    RESUME CONTENT:
-    {resume_text}
-
-    COMPANY RESEARCH:
-    {company_info}
-
-    JOB DESCRIPTION:
-    {jd_text}
+def load_prompt_template(name: str = "default"):
+    """Load the named prompt template for email generation (prompt.txt by default)"""
+    return SHARED_TEMPLATES.get(name, PROMPT)
 
-    EMAIL TEMPLATE (if provided):
-    {email_template}
-
-    IMPORTANT INSTRUCTIONS:
-    - Write ONLY the email content - no introductory text, no explanations
-    - Start with "SUBJECT:" followed by a compelling, creative subject line
-    - Do not include phrases like "Here is a cold email" or "Below is the email"
-    - Make the subject line engaging and specific to the company/role
-    - Write in clear, well-structured paragraphs
-    - Each paragraph should focus on one main point
-    - Use proper spacing between paragraphs
-    - Keep it professional but conversational
-    - Include specific technical skills that match the role
-    - End with a clear call-to-action
-
-    Format EXACTLY like this example:
-    SUBJECT: Driving AI Innovation at [Company Name] - [Your Value Proposition]
-
-    Hi [Company] Team,
-
-    [Opening paragraph - express interest and connection to company]
-
-    [Second paragraph - highlight relevant experience and achievements]
-
-    [Third paragraph - explain why you're a good fit and what you can contribute]
-
-    [Closing paragraph - call to action]
-
-    Best regards,
-    [Candidate Name]
-
-    Remember: 
-    - Create compelling, specific subject lines
-    - Write in clear paragraphs with proper spacing
-    - Make each paragraph focused and purposeful
-    - Keep the tone professional yet personable
-    """
+def build_email_messages(resume_text: str, company_info: str, jd_text: str, email_template: str = "",
+                         prompt_name: str = "default"):
+    """Chat messages for the cold email prompt"""
+    prompt_template = load_prompt_template(prompt_name)
     
-    # If template is uploaded, use it
-    if uploaded_template is not None:
-        return default_prompt
+    final_prompt = prompt_template.format(
+        resume_text=resume_text,
+        company_info=company_info,
+        jd_text=jd_text,
+        email_template=email_template
+    )
     
-    # Otherwise try to load from prompt.txt file
-    try:
-        with open("prompt.txt", "r", encoding="utf-8") as file:
-            return file.read()
-    except FileNotFoundError:
-        return default_prompt
+    return [
+        {"role": "system", "content": "You are writing a cold email directly as the job candidate. Write ONLY the email content with subject line. Do not include any introductory text, explanations, or meta-commentary. Start directly with 'SUBJECT:' followed by the email content."},
+        {"role": "user", "content": final_prompt}
+    ]
+
+EMAIL_PREAMBLE = re.compile(r'^\s*(here is|here\'s|below is|i have)\b', re.IGNORECASE)
+EMAIL_GREETING = re.compile(r'^(hi|hello|dear|greetings|hey)\b', re.IGNORECASE)
+EMAIL_SIGN_OFF = re.compile(r'^(best|regards|kind regards|warm regards|thanks|thank you|sincerely|cheers)\b', re.IGNORECASE | re.MULTILINE)
+EMAIL_PLACEHOLDER = re.compile(r'\[[^\]]{2,40}\]|\{[a-z_]+\}')
+
+def score_email_draft(text: str) -> float:
+    """Cheap local quality score of a draft: subject, greeting, length, sign-off, leftovers"""
+    lines = [line.strip() for line in text.strip().split('\n') if line.strip()]
+    if not lines:
+        return 0.0
+    
+    score = 0.0
+    body_lines = lines
+    if lines[0].upper().startswith("SUBJECT:"):
+        subject_words = len(lines[0][len("SUBJECT:"):].split())
+        score += 2 if subject_words else 0
+        score += 1 if 3 <= subject_words <= 12 else 0
+        body_lines = lines[1:]
+    
+    if body_lines and EMAIL_GREETING.match(body_lines[0]):
+        score += 1
+    
+    # Cold emails that get read are short: aim for roughly 120-200 words
+    words = len(' '.join(body_lines).split())
+    if 120 <= words <= 200:
+        score += 2
+    elif 80 <= words <= 250:
+        score += 1
+    else:
+        score -= min(abs(words - 160) / 100, 2)
+    
+    if EMAIL_SIGN_OFF.search('\n'.join(body_lines)):
+        score += 0.5
+    if EMAIL_PREAMBLE.match(text):
+        score -= 1
+    score -= len(EMAIL_PLACEHOLDER.findall(text))
+    return score
+
+def rank_email_drafts(drafts: List[str]) -> List[Dict]:
+    """Drop empty and duplicate drafts, return [{'text', 'score'}] best first"""
+    ranked, seen = [], set()
+    for text in drafts:
+        key = ' '.join(text.lower().split())
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        ranked.append({'text': text, 'score': score_email_draft(text)})
+    ranked.sort(key=lambda draft: draft['score'], reverse=True)
+    return ranked
+
+async def _complete_variants(chat: GroqChat, messages: List[Dict[str, str]], variants: int, use_cache: bool):
+    """Request several drafts at once; only the first reads or writes the cache"""
+    return await asyncio.gather(
+        *(chat.complete_task('email', messages, max_tokens=1024, temperature=0.7, use_cache=use_cache and i == 0,
+                             store=i == 0)
+          for i in range(variants)),
+        return_exceptions=True
+    )
 
-def generate_email(groq_api_key: str, resume_text: str, company_info: str, jd_text: str, email_template: str = ""):
-    """Generate cold email using Groq API"""
+def generate_email(groq_api_key: str, messages: List[Dict[str, str]], llm_cache: Optional[LLMCache] = None,
+                   use_cache: bool = True, variants: int = 1):
+    """
+    Generate cold email from build_email_messages using Groq API; use_cache=False asks for a fresh draft.
+    
+    With variants > 1 the drafts are requested in parallel and a ranked list
+    from rank_email_drafts is returned instead of a single string.
+    """
+    chat = shared_groq_chat(groq_api_key, llm_cache)
     try:
-        client = Groq(api_key=groq_api_key)
-        prompt_template = load_prompt_template()
-        
-        final_prompt = prompt_template.format(
-            resume_text=resume_text,
-            company_info=company_info,
-            jd_text=jd_text,
-            email_template=email_template
-        )
+        if variants <= 1:
+            return run_sync(chat.complete_task('email', messages, max_tokens=1024, temperature=0.7, use_cache=use_cache))
         
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": "You are writing a cold email directly as the job candidate. Write ONLY the email content with subject line. Do not include any introductory text, explanations, or meta-commentary. Start directly with 'SUBJECT:' followed by the email content."},
-                {"role": "user", "content": final_prompt}
-            ],
-            model="llama3-70b-8192",
-            max_tokens=1024,
-            temperature=0.7
-        )
-        
-        return chat_completion.choices[0].message.content.strip()
+        results = run_sync(_complete_variants(chat, messages, variants, use_cache))
+        drafts = [result for result in results if isinstance(result, str)]
+        if not drafts:
+            raise results[0]
+        return rank_email_drafts(drafts)
         
     except Exception as e:
         st.error(f"Error generating email: {e}")
-        return ""
+        return "" if variants <= 1 else []
+
+def stream_email(groq_api_key: str, messages: List[Dict[str, str]], llm_cache: Optional[LLMCache] = None,
+                 use_cache: bool = True):
+    """
+    Generate cold email from build_email_messages using Groq API, yielding text chunks as they arrive.
+    
+    Errors, including a stream cut off midway, propagate to the caller, so
+    a partial draft is never mistaken for a finished one.
+    """
+    chat = shared_groq_chat(groq_api_key, llm_cache)
+    yield from iterate_sync(chat.stream_task('email', messages, max_tokens=1024, temperature=0.7, use_cache=use_cache))
 
 def get_gmail_credentials():
     """Get Gmail credentials from Streamlit secrets"""
@@ -586,66 +320,40 @@ def get_gmail_credentials():
         st.error("❌ Gmail credentials not found in secrets. Please configure them in Streamlit Cloud settings.")
         return None
 
-def authenticate_gmail():
-    """Authenticate Gmail API using credentials from secrets"""
-    creds = None
-    
-    # Load existing token if available
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
+@st.cache_resource(show_spinner=False)
+def shared_gmail_client(client_id: str, _client_config: Dict) -> GmailClient:
+    """One signed-in Gmail client per OAuth client id, kept across reruns and sessions"""
+    return GmailClient(_client_config)
 
-    # If no valid credentials, get new ones
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-            except Exception as e:
-                st.error(f"Error refreshing Gmail token: {e}")
-                creds = None
-        
-        if not creds:
-            # Get credentials from secrets
-            gmail_creds_dict = get_gmail_credentials()
-            if not gmail_creds_dict:
-                return None
-            
-            try:
-                # Create temporary credentials file for OAuth flow
-                import tempfile
-                import json
-                
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-                    json.dump(gmail_creds_dict, temp_file)
-                    temp_creds_path = temp_file.name
-                
-                # Use the temporary file for OAuth flow
-                flow = InstalledAppFlow.from_client_secrets_file(temp_creds_path, SCOPES)
-                creds = flow.run_local_server(port=0)
-                
-                # Clean up temporary file
-                os.unlink(temp_creds_path)
-                
-            except Exception as e:
-                st.error(f"Error during Gmail authentication: {e}")
-                return None
-
-        # Save credentials for future use
-        try:
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
-        except Exception as e:
-            st.warning(f"Could not save Gmail token: {e}")
+def authenticate_gmail() -> Optional[GmailClient]:
+    """Authenticate Gmail API using credentials from secrets"""
+    gmail_creds_dict = get_gmail_credentials()
+    if not gmail_creds_dict:
+        return None
 
-    # Build and return Gmail service
+    # Signs in (or loads token.json) only on the first send; later sends
+    # reuse the client, whose token is refreshed in the background
+    client_id = gmail_creds_dict["installed"]["client_id"]
     try:
-        service = build('gmail', 'v1', credentials=creds)
-        return service
+        gmail = shared_gmail_client(client_id, gmail_creds_dict)
+        if gmail.needs_sign_in:
+            # Google rejected the refresh token: drop the client and sign in again
+            st.warning(f"⚠️ Gmail access expired or was revoked ({gmail.refresh_error}); signing in again")
+            gmail = sign_in_again(client_id, gmail, gmail_creds_dict)
+        elif gmail.refresh_error is not None:
+            st.warning(f"⚠️ Could not refresh the Gmail token in the background: {gmail.refresh_error}")
+        return gmail
     except Exception as e:
-        st.error(f"Error building Gmail service: {e}")
+        st.error(f"Error during Gmail authentication: {e}")
         return None
 
-def send_email(service, to_email: str, subject: str, body: str):
+def sign_in_again(client_id: str, gmail: GmailClient, client_config: Dict) -> GmailClient:
+    """Forget a client whose refresh token is dead and build a new one, which runs the sign-in flow"""
+    gmail.sign_out()
+    shared_gmail_client.clear()
+    return shared_gmail_client(client_id, client_config)
+
+def send_email(gmail: GmailClient, to_email: str, subject: str, body: str):
     """Send email via Gmail API with proper HTML formatting"""
     try:
         # Convert plain text to HTML with proper formatting
@@ -671,14 +379,15 @@ def send_email(service, to_email: str, subject: str, body: str):
         html_part = MIMEText(html_body, 'html')
         message.attach(html_part)
         
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        sent = service.users().messages().send(
-            userId="me", 
-            body={'raw': raw}
-        ).execute()
-        
-        return sent['id']
+        try:
+            return gmail.send(message)
+        except RefreshError:
+            # The token expired and could not be refreshed: sign in again and retry once
+            gmail_creds_dict = get_gmail_credentials()
+            if not gmail_creds_dict:
+                return None
+            gmail = sign_in_again(gmail_creds_dict["installed"]["client_id"], gmail, gmail_creds_dict)
+            return gmail.send(message)
     except Exception as e:
         st.error(f"Error sending email: {e}")
         return None
@@ -728,6 +437,10 @@ def main():
         st.markdown("[Apollo.io](https://apollo.io) - Contact search")
         st.markdown("[RocketReach](https://rocketreach.co) - Email finder")
     
+    # Caches and clients live for the whole process, so reruns reuse them
+    caches = shared_caches()
+    llm_cache = caches['llm']
+    
     # Main content area
     tab1, tab2 = st.tabs(["📊 Company Research Mode", "📝 Manual JD Mode"])
     
@@ -745,6 +458,8 @@ def main():
         
         # Company name input
         company_name = st.text_input("🏢 Company Name", placeholder="e.g., OpenAI, Tesla")
+        deep_crawl = st.checkbox("🕸️ Also read About/Team/Products pages", value=False,
+                                 help="Fetches linked same-site pages in parallel for a richer analysis")
         
         if st.button("🚀 Research Company", type="primary", use_container_width=True):
             if not groq_api_key:
@@ -755,43 +470,29 @@ def main():
                 st.warning("⚠️ Please upload resume and enter company name")
                 return
             
-            # Single status placeholder for all progress updates
-            status_placeholder = st.empty()
+            # One status line per stage, updated as the research reports progress
+            status_area = st.container()
+            stage_lines = {}
+            result = None
             
-            # Initialize researcher
-            researcher = CompanyResearcher(groq_api_key)
-            
-            # Step 1: Research company
-            status_placeholder.info("🔍 Searching for company website...")
-            website_url = researcher.search_company_website(company_name)
-            
-            if not website_url:
-                status_placeholder.error("❌ Could not find company website")
-                return
+            # Reused across clicks: no new clients, pools or cache handles per research
+            researcher = shared_researcher(groq_api_key)
             
-            status_placeholder.success(f"✅ Found website: {website_url}")
-            time.sleep(0.5)  # Brief pause for user to see
+            for event in researcher.research_events(company_name, crawl=deep_crawl):
+                if 'result' in event:
+                    result = event['result']
+                else:
+                    render_research_event(event, stage_lines, status_area)
             
-            status_placeholder.info("🕷️ Scraping website content...")
-            website_content = researcher.scrape_website_content(website_url)
-            if not website_content:
-                status_placeholder.error("❌ Could not scrape website content")
+            if result is None or result.get('error'):
+                st.error(f"❌ {result['error'] if result else 'Research failed'}")
                 return
             
-            status_placeholder.success("✅ Website content scraped successfully!")
-            time.sleep(0.5)
-            
-            status_placeholder.info("🤖 Analyzing content with AI...")
-            analysis = researcher.analyze_with_llm(company_name, website_content)
-            
-            status_placeholder.success("✅ AI analysis completed!")
-            time.sleep(0.5)
-            
-            status_placeholder.info("👥 Searching for founder information...")
-            founders = researcher.find_founders(company_name)
-            
-            # Clear status and show final result
-            status_placeholder.success("✅ Research completed!")
+            website_url = result['website_url']
+            analysis = result['analysis']
+            founders = result['founders']
+            prompt_report = result.get('prompt_tokens')
+            st.success(f"✅ Research completed in {event.get('elapsed_ms', 0) / 1000:.1f}s")
             
             # Store results in session state
             st.session_state.company_research = {
@@ -810,6 +511,9 @@ def main():
                 
                 with st.expander("📊 Company Analysis", expanded=True):
                     st.markdown(analysis)
+                    if prompt_report:
+                        st.caption(f"Website content sent to the model: ~{prompt_report['tokens_after']:,} tokens "
+                                   f"(compacted from ~{prompt_report['tokens_before']:,})")
             
             with col2:
                 st.subheader("👥 Founders Found")
@@ -879,30 +583,31 @@ def main():
         col1, col2 = st.columns([2, 1])
         
         with col1:
+            fresh_draft = st.checkbox("🎲 Write a fresh draft", value=False,
+                                      help="Ask the model again instead of reusing the cached email for identical inputs")
+            draft_count = st.select_slider("📑 Drafts to compare", options=[1, 2, 3, 4], value=1,
+                                           help="Several drafts are written in parallel and ranked best first")
+            prompt_name = st.selectbox("🧾 Prompt", SHARED_TEMPLATES.names(PROMPT),
+                                       help="prompt.txt is 'default'; add more as prompts/<name>.txt")
+            bundled_template = st.selectbox("📎 Bundled email template", ["None"] + SHARED_TEMPLATES.names(EMAIL),
+                                            help="Used when no template was uploaded (files in templates/)")
             if st.button("🤖 Generate Cold Email", type="primary", use_container_width=True):
                 if not groq_api_key:
                     st.error("❌ Please add your Groq API key")
                     return
                 
-                # Extract resume text
-                resume_text = extract_resume_text(data['resume_file'])
+                # Parse the resume (once per distinct file) into a structured profile
+                resume = ingest_resume(data['resume_file'].getvalue(), caches['resume'])
                 
-                # Extract email template if provided
+                # Uploaded template first, otherwise the bundled one picked above
                 email_template = ""
                 if data.get('email_template_file'):
-                    template_file = data['email_template_file']
+                    email_template = read_email_template(data['email_template_file'])
+                elif bundled_template != "None":
                     try:
-                        if template_file.name.endswith('.txt'):
-                            # For text files, read as string
-                            template_file.seek(0)  # Reset file pointer
-                            email_template = template_file.read().decode("utf-8")
-                        elif template_file.name.endswith('.docx'):
-                            # For DOCX files, use the helper function
-                            template_file.seek(0)  # Reset file pointer
-                            email_template = extract_text_from_docx(template_file)
-                    except Exception as e:
+                        email_template = SHARED_TEMPLATES.get(bundled_template, EMAIL)
+                    except TemplateError as e:
                         st.warning(f"Could not read email template: {e}")
-                        email_template = ""
                 
                 # Prepare company info
                 if mode == "research":
@@ -911,139 +616,108 @@ def main():
                 else:
                     company_info = f"Company: {data['company_name']}\n\nJob posting analysis:\n{data['analysis']}"
                     jd_text = data['jd_text']
+                    st.session_state.jd_match = rank_jds(resume['text'], [jd_text])[0]
                 
-                # Generate email
-                email_content = generate_email(groq_api_key, resume_text, company_info, jd_text, email_template)
+                # Only the resume sections that match this job go into the prompt
+                resume_text = select_resume_sections(resume['profile'], f"{jd_text}\n{company_info}")
+                try:
+                    messages = build_email_messages(resume_text, company_info, jd_text, email_template, prompt_name)
+                except (TemplateError, KeyError) as e:
+                    # Invalid prompt file, or one removed since the page was drawn
+                    st.error(f"Error generating email: {e}")
+                    return
+                
+                # Each request reserves its prompt plus max_tokens of the model's
+                # per-minute budget, so on a free key several drafts queue up
+                wait = shared_groq_chat(groq_api_key, llm_cache).expected_wait('email', messages, count=draft_count)
+                if wait >= 5:
+                    st.info(f"⏳ The Groq rate limit may hold {'these drafts' if draft_count > 1 else 'this email'} "
+                            f"back for up to ~{wait:.0f}s (fewer drafts or a paid key are faster)")
+                
+                start = time.perf_counter()
+                if draft_count > 1:
+                    # Several drafts at once, ranked so the best one is preselected
+                    with st.spinner(f"✍️ Writing {draft_count} drafts in parallel..."
+                                    + (f" (up to ~{wait:.0f}s of rate-limit waiting)" if wait >= 5 else "")):
+                        drafts = generate_email(groq_api_key, messages, llm_cache=llm_cache,
+                                                use_cache=not fresh_draft, variants=draft_count)
+                    if drafts:
+                        st.session_state.email_drafts = drafts
+                        st.session_state.generated_email = drafts[0]['text']
+                        st.session_state.email_timing = {'total': time.perf_counter() - start}
+                else:
+                    # Generate email, showing tokens as the model writes them
+                    stream_placeholder = st.empty()
+                    chunks = []
+                    first_token_at = None
+                    try:
+                        for chunk in stream_email(groq_api_key, messages, llm_cache=llm_cache,
+                                                  use_cache=not fresh_draft):
+                            if first_token_at is None:
+                                first_token_at = time.perf_counter()
+                            chunks.append(chunk)
+                            stream_placeholder.text(''.join(chunks) + "▌")
+                        finished = True
+                    except Exception as e:
+                        # Only a completed stream becomes the draft; a cut-off one is discarded
+                        finished = False
+                        st.error(f"Error generating email: {e}"
+                                 + (" (the partial draft was discarded)" if chunks else ""))
+                    stream_placeholder.empty()
+                    
+                    email_content = ''.join(chunks).strip()
+                    if finished and email_content:
+                        st.session_state.pop('email_drafts', None)
+                        st.session_state.generated_email = email_content
+                        st.session_state.email_timing = {
+                            'first_token': first_token_at - start,
+                            'total': time.perf_counter() - start
+                        }
                 
-                if email_content:
-                    st.session_state.generated_email = email_content
+                # Snapshot once per generate: stats() scans the cache table,
+                # too slow to repeat on every rerun
+                st.session_state.llm_cache_stats = llm_cache.stats()
         
         with col2:
             recipient_email = st.text_input("📧 Recipient Email", placeholder="founder@company.com")
+            cache_stats = st.session_state.get('llm_cache_stats')
+            if cache_stats and (cache_stats['hits'] or cache_stats['misses']):
+                st.caption(f"⚡ LLM cache: {cache_stats['hit_rate']:.0%} hit rate "
+                           f"({cache_stats['hits']} hits, {cache_stats['misses']} misses)")
+            lane = SHARED_SCHEDULER.stats()['lanes']['interactive']
+            if lane['max_wait'] >= 1:
+                st.caption(f"🚦 Groq rate limit: waited {lane['avg_wait']:.1f}s on average "
+                           f"({lane['max_wait']:.1f}s max) for {lane['requests']} requests")
+            match = st.session_state.get('jd_match')
+            if mode == "manual" and match:
+                st.caption(f"🎯 Resume match: {match['score']:.0%}"
+                           + (f" · missing {', '.join(match['missing_skills'][:5])}" if match['missing_skills'] else ""))
+        
+        # Side-by-side drafts when several were requested
+        drafts = st.session_state.get('email_drafts', [])
+        if len(drafts) > 1:
+            st.subheader("📑 Drafts")
+            for i, (draft_col, draft) in enumerate(zip(st.columns(len(drafts)), drafts)):
+                with draft_col:
+                    st.caption(f"#{i + 1} · score {draft['score']:.1f}")
+                    st.text_area("Draft", value=draft['text'], height=260,
+                                 disabled=True, label_visibility="collapsed")
+                    if st.button("Use this draft", key=f"use_draft_{i}", use_container_width=True):
+                        st.session_state.generated_email = draft['text']
         
         # Display generated email
         if 'generated_email' in st.session_state:
             st.subheader("📧 Generated Email")
             
-            email_content = st.session_state.generated_email
-            
-            # Clean the email content more aggressively
-            def clean_email_content(content):
-                # Remove common AI artifacts and instruction text
-                content = re.sub(r'Here is a cold email.*?:', '', content, flags=re.IGNORECASE)
-                content = re.sub(r'Below is.*?email.*?:', '', content, flags=re.IGNORECASE)
-                content = re.sub(r'I.*?generated.*?email.*?:', '', content, flags=re.IGNORECASE)
-                content = re.sub(r'Based on.*?information.*?:', '', content, flags=re.IGNORECASE)
-                content = re.sub(r'Here.*?personalized.*?email.*?:', '', content, flags=re.IGNORECASE)
-                
-                # Remove any remaining instructional phrases
-                content = re.sub(r'^\s*Here.*?:\s*', '', content, flags=re.MULTILINE | re.IGNORECASE)
-                content = re.sub(r'^\s*Below.*?:\s*', '', content, flags=re.MULTILINE | re.IGNORECASE)
-                
-                # Clean up extra whitespace and line breaks
-                content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)  # Max 2 line breaks
-                content = content.strip()
-                
-                return content
-            
-            # Clean the content first
-            email_content = clean_email_content(email_content)
+            timing = st.session_state.get('email_timing')
+            if timing and 'first_token' in timing:
+                st.caption(f"⏱️ First words after {timing['first_token']:.2f}s, full email in {timing['total']:.2f}s")
+            elif timing:
+                st.caption(f"⏱️ {len(drafts)} drafts written in {timing['total']:.2f}s")
             
-            # Parse subject and body more robustly
-            subject_part = ""
-            body_part = ""
-            
-            if "SUBJECT:" in email_content:
-                # Split on SUBJECT: and handle the content after it
-                lines = email_content.split('\n')
-                subject_line = ""
-                body_lines = []
-                found_subject = False
-                skip_next_empty = False
-                
-                for line in lines:
-                    line_stripped = line.strip()
-                    if line_stripped.startswith("SUBJECT:") and not found_subject:
-                        # Extract everything after "SUBJECT:" on this line
-                        subject_line = line_stripped.replace("SUBJECT:", "").strip()
-                        found_subject = True
-                        skip_next_empty = True
-                    elif found_subject:
-                        if skip_next_empty and not line_stripped:
-                            skip_next_empty = False
-                            continue
-                        if line_stripped:  # Only add non-empty lines
-                            body_lines.append(line_stripped)
-                        else:
-                            body_lines.append("")  # Preserve paragraph breaks
-                
-                # Use the extracted subject or fallback to default
-                subject_part = subject_line if subject_line else f"Application for position at {data['company_name']}"
-                body_part = '\n'.join(body_lines).strip()
-                
-                # Additional check: if no subject found, look for "Subject:" (without colon)
-                if not subject_line:
-                    for line in lines:
-                        line_stripped = line.strip()
-                        if line_stripped.lower().startswith("subject"):
-                            # Try to extract subject from various formats
-                            if ":" in line_stripped:
-                                potential_subject = line_stripped.split(":", 1)[1].strip()
-                                if potential_subject and len(potential_subject) > 5:
-                                    subject_part = potential_subject
-                                    break
-            else:
-                # No SUBJECT: marker found, use default subject and full content as body
-                subject_part = f"Application for position at {data['company_name']}"
-                body_part = email_content
-                
-                # Try one more time to find a subject in the content
-                lines = email_content.split('\n')
-                for i, line in enumerate(lines):
-                    line_stripped = line.strip()
-                    if line_stripped.lower().startswith("subject"):
-                        if ":" in line_stripped:
-                            potential_subject = line_stripped.split(":", 1)[1].strip()
-                            if potential_subject and len(potential_subject) > 5:
-                                subject_part = potential_subject
-                                # Remove this line from body
-                                remaining_lines = lines[i+1:]
-                                body_part = '\n'.join(remaining_lines).strip()
-                                break
-            
-            # Final cleaning of body content
-            body_part = clean_email_content(body_part)
-            
-            # Remove any remaining EMAIL BODY: markers and subject lines from body
-            body_part = re.sub(r'EMAIL BODY:\s*', '', body_part, flags=re.IGNORECASE)
-            body_part = re.sub(r'^\s*Email:\s*', '', body_part, flags=re.MULTILINE | re.IGNORECASE)
-            body_part = re.sub(r'^\s*Subject:.*$', '', body_part, flags=re.MULTILINE | re.IGNORECASE)
-            
-            # Ensure proper email formatting with line breaks
-            if body_part:
-                # Split into paragraphs and clean them up
-                paragraphs = body_part.split('\n\n')
-                formatted_paragraphs = []
-                
-                for para in paragraphs:
-                    if para.strip():
-                        # Clean up each paragraph - remove extra line breaks within paragraphs
-                        clean_para = para.replace('\n', ' ').strip()
-                        # Remove extra spaces
-                        clean_para = re.sub(r'\s+', ' ', clean_para)
-                        if clean_para:
-                            formatted_paragraphs.append(clean_para)
-                
-                # Join paragraphs with double line breaks for proper email formatting
-                body_part = '\n\n'.join(formatted_paragraphs)
-                
-                # Ensure it starts with a proper greeting if it doesn't
-                if body_part and not body_part.startswith(('Hi ', 'Hello ', 'Dear ', 'Greetings')):
-                    # Find the first sentence that looks like a greeting
-                    lines = body_part.split('\n')
-                    if lines and not any(greeting in lines[0] for greeting in ['Hi ', 'Hello ', 'Dear ']):
-                        # If no greeting found, the content is probably fine as-is
-                        pass
+            # Split the model output into subject and paragraphs, dropping meta-commentary
+            subject_part, body_part, _ = parsed_email(st.session_state.generated_email,
+                                                      f"Application for position at {data['company_name']}")
             
             # Editable fields
             col1, col2 = st.columns([1, 1])
@@ -1058,10 +732,10 @@ def main():
                         # Final cleaning before sending
                         final_body = body_part.strip()
                         
-                        gmail_service = authenticate_gmail()
+                        gmail = authenticate_gmail()
                         
-                        if gmail_service:
-                            message_id = send_email(gmail_service, recipient_email, subject, final_body)
+                        if gmail:
+                            message_id = send_email(gmail, recipient_email, subject, final_body)
                             
                             if message_id:
                                 st.success(f"✅ Email sent successfully!")
@@ -1080,7 +754,7 @@ def main():
             st.text_area("Email Body Preview", value=body_part, height=300, key="email_body")
             
             # Download option
-            email_data = f"Subject: {subject_part}\n\nTo: {recipient_email if recipient_email else '[Recipient Email]'}\n\nBody:\n{body_part}"
+            email_data = email_download_text(subject_part, recipient_email, body_part)
             st.download_button(
                 "📄 Download Email",
                 data=email_data,
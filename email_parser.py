@@ -0,0 +1,69 @@
+import re
+from typing import List, Tuple
+
+# Meta-commentary the model wraps around the email ("Here is a cold email
+# for Acme:"), removed wherever it appears on a line
+ARTIFACTS = re.compile(
+    r'Here is a cold email.*?:'
+    r'|Below is.*?email.*?:'
+    r'|\bI\b.*?generated.*?email.*?:'
+    r'|Based on.*?information.*?:'
+    r'|Here.*?personalized.*?email.*?:',
+    re.IGNORECASE
+)
+# Lead-ins at the start of a line ("Here's the draft:", "Below you'll find:")
+LEAD_IN = re.compile(r'^\s*(?:here|below).*?:\s*', re.IGNORECASE)
+# Section labels the prompt sometimes echoes back
+LABELS = re.compile(r'EMAIL BODY:\s*|^\s*Email:\s*', re.IGNORECASE)
+# "SUBJECT: ...", "Subject line: ...", "**Subject:** ..."
+SUBJECT_LINE = re.compile(r'^[*_]*subject(?: line)?[*_]*\s*:[*_]*\s*(.*?)[*_]*$', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+
+def parse_email(content: str, default_subject: str = "") -> Tuple[str, str, List[str]]:
+    """
+    Split raw model output into (subject, body, paragraphs).
+
+    One pass over the lines strips meta-commentary and echoed labels,
+    finds the subject line (an exact "SUBJECT:" line wins over other
+    spellings) and groups the remaining lines into paragraphs, each joined
+    onto one line. Lines before the subject line are dropped, as are later
+    subject lines. Without a subject line the whole text is the body and
+    default_subject is returned.
+    """
+    lines = []
+    subject_index = fallback_index = None
+    subject = fallback = ""
+
+    for line in content.split('\n'):
+        # Every clean-up pattern ends in a colon; most lines have none
+        if ':' in line:
+            line = LABELS.sub('', LEAD_IN.sub('', ARTIFACTS.sub('', line)))
+        line = line.strip()
+        if subject_index is None and line and line[0] in '*_Ss':
+            match = SUBJECT_LINE.match(line)
+            if match is not None:
+                if line.startswith("SUBJECT:"):
+                    subject_index, subject = len(lines), line.replace("SUBJECT:", "").strip()
+                elif fallback_index is None and len(match.group(1)) > 5:
+                    fallback_index, fallback = len(lines), match.group(1)
+        lines.append(line)
+
+    if subject_index is None:
+        subject_index, subject = fallback_index, fallback
+    start = subject_index + 1 if subject_index is not None else 0
+
+    paragraphs = []
+    current = []
+    for line in lines[start:]:
+        # A stray later subject line is dropped and ends the paragraph, like a blank line
+        if not line or (line[0] in '*_Ss' and SUBJECT_LINE.match(line)):
+            if current:
+                paragraphs.append(WHITESPACE.sub(' ', ' '.join(current)))
+                current = []
+        else:
+            current.append(line)
+    if current:
+        paragraphs.append(WHITESPACE.sub(' ', ' '.join(current)))
+
+    return subject or default_subject, '\n\n'.join(paragraphs), paragraphs
@@ -0,0 +1,109 @@
+import re
+from typing import List
+
+# A full person name: two or three capitalized words, optionally with a
+# middle initial (Jean-Luc, O'Neil, McAdams)
+_UPPER, _LOWER = "A-ZÀ-Þ", "a-zß-ÿ"
+_WORD = rf"[{_UPPER}](?:'[{_UPPER}])?[{_LOWER}]+(?:[{_UPPER}][{_LOWER}]+)?(?:-[{_UPPER}]?[{_LOWER}]+)?"
+NAME = rf"{_WORD}(?:\s+[A-Z]\.)?(?:\s+{_WORD}){{1,2}}"
+NAME_LIST = rf"{NAME}(?:\s*,\s*{NAME})*(?:,?\s+(?:and|&)\s+{NAME})?"
+
+_ROLE = r"(?:CEO|CTO|COO|CFO|President|Chairman|Chief [A-Z][a-z]+ Officer)"
+_EXTRA_ROLE = rf"(?:\s*(?:,|and|&)\s*(?:the\s+)?{_ROLE})?"
+
+# Phrasings that tie names to founding the company. Names are captured in
+# a `names` group and, for "X founded Acme with Y", a `partners` group.
+FOUNDER_PATTERNS = [re.compile(pattern) for pattern in (
+    # "founded by Jane Doe and John Smith", "co-founded in (May) 2015 by Jane Doe"
+    rf"\b(?:[Cc]o-?)?[Ff]ounded\s+(?:in\s+(?:[A-Z][a-z]+\s+)?\d{{4}}\s+)?by\s+(?P<names>{NAME_LIST})",
+    # "Jane Doe, co-founder and CEO", "Jane Doe, CEO and co-founder", "Jane Doe (founder)"
+    rf"(?P<names>{NAME})\s*(?:,|\(|-|–|—)\s*(?:the\s+|a\s+)?(?:{_ROLE}\s+(?:and|&)\s+)?(?:[Cc]o-?\s?)?[Ff]ounders?\b",
+    # "Jane Doe is the co-founder", "Jane Doe was one of the founders"
+    rf"(?P<names>{NAME_LIST})\s+(?:is|was|are|were)\s+(?:the\s+|a\s+|one\s+of\s+the\s+)?(?:[Cc]o-?\s?)?[Ff]ounders?\b",
+    # "Founder and CEO Jane Doe", "CEO and co-founder Jane Doe"
+    rf"(?:(?:CEO|CTO|COO|President)\s+(?:and|&)\s+)?\b(?:[Cc]o-?\s?)?[Ff]ounders?{_EXTRA_ROLE}\s+(?P<names>{NAME_LIST})",
+    # "Jane Doe and John Smith founded Acme", "Jane Doe co-founded Acme with John Smith"
+    rf"(?P<names>{NAME_LIST})\s+(?:co-?)?founded\b(?:\s+(?:[\w.&'-]+\s+){{1,3}}?with\s+(?P<partners>{NAME_LIST}))?",
+)]
+
+_NAME_IN_LIST = re.compile(NAME)
+
+# Capitalized words that show up next to founder phrases but are not people
+NOT_NAME_WORDS = frozenset((
+    'The', 'In', 'Our', 'Its', 'His', 'Her', 'Their', 'Company', 'Team', 'Group', 'Inc', 'Llc', 'Ltd',
+    'Corporation', 'Founder', 'Founders', 'Cofounder', 'Chief', 'Executive', 'Officer', 'President',
+    'Director', 'Board', 'Today', 'Since', 'Before', 'After', 'About', 'Meet', 'Read', 'More', 'News',
+    'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October',
+    'November', 'December', 'Linkedin', 'Twitter', 'Crunchbase', 'Wikipedia', 'Forbes', 'Techcrunch',
+))
+
+# Stop words and titles of filter_founder_names (shared with the LLM path)
+STOP_WORDS = re.compile(r'\b(team|company|founded|the|inc|llc|ltd|corporation|group)\b', re.IGNORECASE)
+TITLES = re.compile(r'\b(?:CEO|CTO|CFO|COO|President|Director)\b|\b(?:Mr|Ms|Dr|Prof)\.', re.IGNORECASE)
+LIST_MARKER = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s*')
+
+
+def filter_founder_names(names: List[str]) -> List[str]:
+    """Drop entries with non-name words, strip titles, keep full names and plausible single names"""
+    filtered_names = []
+    for name in names:
+        name = LIST_MARKER.sub('', name).strip().strip('"')
+        # Skip if contains common non-name words
+        if STOP_WORDS.search(name):
+            continue
+
+        # Remove any titles
+        clean_name = ' '.join(TITLES.sub('', name).split())
+
+        if clean_name and len(clean_name) > 2:
+            # Prefer full names (first + last) but accept reasonable single names too
+            if ' ' in clean_name:
+                filtered_names.append(clean_name)
+            elif len(clean_name) >= 4 and clean_name.isalpha():
+                filtered_names.append(clean_name)
+
+    return filtered_names
+
+
+def _trim_name(name: str) -> str:
+    """
+    Strip capitalized non-name words the pattern swallowed at either end
+    ("Today Jane Doe"); empty if what is left is not a full name
+    """
+    words = name.split()
+    while words and words[0] in NOT_NAME_WORDS:
+        words.pop(0)
+    while words and words[-1] in NOT_NAME_WORDS:
+        words.pop()
+    if len(words) < 2 or any(word in NOT_NAME_WORDS for word in words):
+        return ''
+    return ' '.join(words)
+
+
+def extract_founders(text: str, company_name: str = '') -> List[str]:
+    """
+    Founder names stated outright in text, in order of first mention.
+
+    Only full names matched by FOUNDER_PATTERNS count, so an empty list
+    means "not confident", not "no founders": callers should fall back to
+    the LLM then.
+    """
+    company_words = {word.lower() for word in re.findall(r'\w+', company_name)}
+    found = []
+    seen = set()
+
+    for pattern in FOUNDER_PATTERNS:
+        for match in pattern.finditer(text):
+            for group in ('names', 'partners'):
+                if group not in pattern.groupindex or match.group(group) is None:
+                    continue
+                for name_match in _NAME_IN_LIST.finditer(match.group(group)):
+                    name = _trim_name(name_match.group())
+                    if not name or any(word.lower() in company_words for word in name.split()):
+                        continue
+                    if name.lower() not in seen:
+                        seen.add(name.lower())
+                        found.append((match.start(group) + name_match.start(), name))
+
+    found.sort()
+    return filter_founder_names([name for _, name in found])
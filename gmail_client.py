@@ -0,0 +1,175 @@
+import base64
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from email.mime.base import MIMEBase
+from typing import Dict, Optional
+
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+
+# Gmail API Scopes
+SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+
+# Authorized-user JSON (access and refresh token) written after sign-in.
+# Replaces the old token.pickle, which is no longer read.
+TOKEN_PATH = os.environ.get("COLD_OUTREACH_GMAIL_TOKEN", "token.json")
+
+_discovery = None
+_discovery_lock = threading.Lock()
+
+
+def gmail_discovery() -> Dict:
+    """Gmail v1 discovery document bundled with google-api-python-client, parsed once"""
+    global _discovery
+    with _discovery_lock:
+        if _discovery is None:
+            document = discovery_cache.get_static_doc('gmail', 'v1')
+            if document is None:
+                raise RuntimeError("google-api-python-client has no bundled Gmail v1 discovery document")
+            _discovery = json.loads(document)
+        return _discovery
+
+
+def load_token(path: str = TOKEN_PATH) -> Optional[Credentials]:
+    """Stored credentials, or None if there are none or they cannot be read"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return Credentials.from_authorized_user_info(json.load(f), SCOPES)
+    except (OSError, ValueError):
+        return None
+
+
+def save_token(creds: Credentials, path: str = TOKEN_PATH):
+    """Write credentials as JSON, readable only by the owner, replacing the old file atomically"""
+    temp_path = f"{path}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(creds.to_json())
+    os.replace(temp_path, path)
+
+
+class GmailClient:
+    """
+    Long-lived Gmail API handle for one OAuth client.
+
+    Credentials are loaded (or obtained through the browser sign-in) and
+    the API service is built from the bundled discovery document once, when
+    the client is created. A daemon thread then refreshes the access token
+    refresh_margin seconds before it expires and stores it, so a send never
+    waits for a token refresh or a service build: it is only the API call.
+
+    A refresh token that Google rejects (revoked, or expired after a week
+    for apps in testing) cannot be fixed by retrying: the client then stops
+    refreshing and needs_sign_in turns true, and the owner should
+    sign_out() and build a new client, which signs in again.
+    """
+
+    def __init__(self, client_config: Dict, token_path: str = TOKEN_PATH,
+                 refresh_margin: float = 300, retry_delay: float = 60):
+        self.client_config = client_config
+        self.token_path = token_path
+        self.refresh_margin = refresh_margin
+        self.retry_delay = retry_delay
+        self.refreshes = 0
+        self.refresh_error = None
+        # The service's httplib2 connection is not thread-safe, and a
+        # refresh must not swap the token under a request in flight
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.creds = self._credentials()
+        self.service = build_from_document(gmail_discovery(), credentials=self.creds)
+        self._refresher = threading.Thread(target=self._refresh_loop, name='gmail-token-refresh', daemon=True)
+        self._refresher.start()
+
+    def _credentials(self) -> Credentials:
+        creds = load_token(self.token_path)
+        if creds is not None and not creds.valid and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+            except RefreshError:
+                # Revoked or expired refresh token: sign in again
+                creds = None
+        if creds is None or not creds.valid:
+            flow = InstalledAppFlow.from_client_config(self.client_config, SCOPES)
+            creds = flow.run_local_server(port=0)
+        save_token(creds, self.token_path)
+        return creds
+
+    @property
+    def needs_sign_in(self) -> bool:
+        """
+        Google rejected the refresh token; only a new sign-in can send again
+        """
+        return isinstance(self.refresh_error, RefreshError)
+
+    def seconds_until_refresh(self) -> Optional[float]:
+        """
+        Time until the background refresh is due, None if the token cannot expire or be refreshed
+        """
+        if self.creds.expiry is None or not self.creds.refresh_token:
+            return None
+        # google-auth keeps expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (self.creds.expiry - now).total_seconds() - self.refresh_margin
+
+    def refresh(self):
+        """
+        Refresh the access token now and store it
+        """
+        with self._lock:
+            self.creds.refresh(Request())
+            self.refreshes += 1
+            save_token(self.creds, self.token_path)
+
+    def _refresh_loop(self):
+        delay = self.seconds_until_refresh()
+        while delay is not None and not self._stop.wait(max(delay, 0)):
+            try:
+                self.refresh()
+                self.refresh_error = None
+                delay = self.seconds_until_refresh()
+            except RefreshError as e:
+                self.refresh_error = e
+                return
+            except Exception as e:
+                # Offline or Google unavailable: try again shortly. If the
+                # token expires meanwhile, the next send refreshes it itself.
+                self.refresh_error = e
+                delay = self.retry_delay
+
+    def send(self, message: MIMEBase) -> str:
+        """
+        Send a MIME message from the signed-in account, returning its Gmail id
+        """
+        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        with self._lock:
+            try:
+                sent = self.service.users().messages().send(userId='me', body={'raw': raw}).execute()
+            except RefreshError as e:
+                # The token expired and Google refused to refresh it
+                self.refresh_error = e
+                raise
+        return sent['id']
+
+    def close(self):
+        """
+        Stop the background refresh
+        """
+        self._stop.set()
+
+    def sign_out(self):
+        """
+        Stop, and delete the stored token so the next client signs in again
+        """
+        self.close()
+        try:
+            os.remove(self.token_path)
+        except FileNotFoundError:
+            pass
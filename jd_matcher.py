@@ -0,0 +1,139 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from resume_parser import tokenize
+
+# Terms that name a concrete skill. They get extra weight in the TF-IDF
+# vectors and drive the skill-coverage part of the score. C and R are left
+# out: as single letters they mostly come from "Series C" or "R&D".
+SKILL_VOCABULARY = frozenset((
+    # languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'golang', 'rust', 'kotlin', 'swift',
+    'scala', 'ruby', 'php', 'matlab', 'sql', 'bash', 'dart', 'julia', 'haskell', 'elixir',
+    # ml / data
+    'pytorch', 'tensorflow', 'keras', 'jax', 'scikit-learn', 'sklearn', 'pandas', 'numpy', 'scipy', 'spark',
+    'pyspark', 'hadoop', 'airflow', 'dbt', 'kafka', 'mlflow', 'kubeflow', 'onnx', 'tensorrt', 'opencv',
+    'huggingface', 'transformers', 'langchain', 'llamaindex', 'llm', 'llms', 'nlp', 'rag', 'lora', 'bert', 'gpt',
+    'yolo', 'cnn', 'rnn', 'lstm', 'xgboost', 'lightgbm', 'tableau', 'powerbi', 'snowflake', 'bigquery',
+    'databricks', 'faiss', 'vector', 'embeddings', 'reinforcement', 'diffusion', 'cuda',
+    # web / mobile
+    'react', 'next.js', 'nextjs', 'vue', 'angular', 'svelte', 'node.js', 'nodejs', 'express', 'django', 'flask',
+    'fastapi', 'spring', 'rails', 'laravel', 'graphql', 'rest', 'grpc', 'html', 'css', 'tailwind', 'redux',
+    'android', 'ios', 'flutter', 'react-native',
+    # infra / data stores
+    'aws', 'gcp', 'azure', 'docker', 'kubernetes', 'k8s', 'terraform', 'ansible', 'linux', 'git', 'ci', 'cd',
+    'jenkins', 'postgresql', 'postgres', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb',
+    'sqlite', 'microservices', 'serverless', 'prometheus', 'grafana',
+))
+
+
+class JDIndex:
+    """
+    TF-IDF matrix over a set of JDs, built once and scored against any resume.
+
+    Each JD is a sparse vector (sublinear tf, IDF over the JD set, skill
+    terms weighted by skill_weight) stored as flat COO arrays: rows, cols
+    and weights over all non-zeros. Scoring a resume is then a handful of
+    NumPy operations over those arrays instead of a loop over JDs.
+    """
+
+    def __init__(self, jd_texts: List[str], skill_weight: float = 2.0):
+        self.size = len(jd_texts)
+        self.vocabulary = {}
+        rows, cols, counts = [], [], []
+        for row, text in enumerate(jd_texts):
+            frequencies = {}
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0) + 1
+            for term, count in frequencies.items():
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+
+        n_terms = len(self.vocabulary)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.float64)
+
+        self.is_skill = np.zeros(n_terms, dtype=bool)
+        for term, column in self.vocabulary.items():
+            self.is_skill[column] = term in SKILL_VOCABULARY
+        self.boost = np.where(self.is_skill, skill_weight, 1.0)
+
+        document_frequency = np.bincount(self.cols, minlength=n_terms)
+        self.idf = np.log((1 + self.size) / (1 + document_frequency)) + 1
+        self.weights = (1 + np.log(counts)) * self.idf[self.cols] * self.boost[self.cols]
+        self.norms = np.sqrt(np.bincount(self.rows, weights=self.weights ** 2, minlength=self.size))
+        self.skill_counts = np.bincount(self.rows, weights=self.is_skill[self.cols], minlength=self.size)
+
+    def resume_vector(self, resume_text: str) -> np.ndarray:
+        """
+        The resume in the JD vocabulary; terms no JD uses cannot score and are dropped
+        """
+        vector = np.zeros(len(self.vocabulary))
+        columns = [self.vocabulary[term] for term in tokenize(resume_text) if term in self.vocabulary]
+        if columns:
+            columns, counts = np.unique(np.asarray(columns, dtype=np.int64), return_counts=True)
+            vector[columns] = (1 + np.log(counts)) * self.idf[columns] * self.boost[columns]
+        return vector
+
+    def score(self, resume_text: str, coverage_weight: float = 0.3) -> Dict[str, np.ndarray]:
+        """
+        Match every JD against the resume in one vectorized pass.
+
+        similarity is the cosine between each JD and the resume, and
+        skill_coverage the share of each JD's skills the resume mentions;
+        score blends them with coverage_weight. Arrays follow JD order.
+        """
+        vector = self.resume_vector(resume_text)
+        resume_norm = np.linalg.norm(vector)
+        on_resume = vector[self.cols]
+
+        dots = np.bincount(self.rows, weights=self.weights * on_resume, minlength=self.size)
+        denominators = self.norms * resume_norm
+        similarity = np.divide(dots, denominators, out=np.zeros(self.size), where=denominators > 0)
+
+        matched = np.bincount(self.rows, weights=self.is_skill[self.cols] & (on_resume > 0), minlength=self.size)
+        coverage = np.divide(matched, self.skill_counts, out=np.zeros(self.size), where=self.skill_counts > 0)
+
+        return {
+            'score': (1 - coverage_weight) * similarity + coverage_weight * coverage,
+            'similarity': similarity,
+            'skill_coverage': coverage,
+        }
+
+
+def score_jds(resume_text: str, jd_texts: List[str], skill_weight: float = 2.0,
+              coverage_weight: float = 0.3) -> Dict[str, np.ndarray]:
+    """Score arrays for jd_texts against the resume (see JDIndex.score)"""
+    return JDIndex(jd_texts, skill_weight).score(resume_text, coverage_weight)
+
+
+def rank_jds(resume_text: str, jd_texts: List[str], top_k: Optional[int] = None, **kwargs) -> List[Dict]:
+    """
+    JDs ranked best match first: [{'index', 'score', 'similarity',
+    'skill_coverage', 'matched_skills', 'missing_skills'}]
+
+    Skill lists are only computed for the returned top_k entries.
+    """
+    if not jd_texts:
+        return []
+    scores = score_jds(resume_text, jd_texts, **kwargs)
+    order = np.argsort(-scores['score'], kind='stable')
+    if top_k is not None:
+        order = order[:top_k]
+
+    resume_terms = set(tokenize(resume_text))
+    ranked = []
+    for index in order.tolist():
+        jd_skills = sorted({term for term in tokenize(jd_texts[index]) if term in SKILL_VOCABULARY})
+        ranked.append({
+            'index': index,
+            'score': float(scores['score'][index]),
+            'similarity': float(scores['similarity'][index]),
+            'skill_coverage': float(scores['skill_coverage'][index]),
+            'matched_skills': [skill for skill in jd_skills if skill in resume_terms],
+            'missing_skills': [skill for skill in jd_skills if skill not in resume_terms],
+        })
+    return ranked
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from groq import AsyncGroq
+
+from cache_store import LLMCache
+from model_router import SHARED_ROUTER, ModelRouter
+from progress import add_tokens
+from prompt_compaction import estimate_tokens
+from rate_limit import INTERACTIVE, SHARED_SCHEDULER, GroqScheduler
+
+DEFAULT_MODEL = "llama3-70b-8192"
+
+
+class GroqChat:
+    """
+    Single path for every Groq chat completion made by the app.
+
+    Identical requests (same model, messages, temperature and max_tokens)
+    are answered from the LLM cache when one is attached. Everything else
+    goes through the rate-limit scheduler (process-wide by default) in the
+    given priority lane; the scheduler also owns retries, so the SDK's own
+    retry loop is disabled. complete_task picks the model through the
+    model router (also process-wide by default). Cache reads and writes run
+    in worker threads so a locked cache file never stalls the event loop.
+    """
+
+    def __init__(self, groq_api_key: str, cache: Optional[LLMCache] = None,
+                 scheduler: Optional[GroqScheduler] = None, priority: int = INTERACTIVE,
+                 router: Optional[ModelRouter] = None):
+        self.client = AsyncGroq(api_key=groq_api_key, max_retries=0)
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else SHARED_SCHEDULER
+        self.priority = priority
+        self.router = router if router is not None else SHARED_ROUTER
+
+    async def complete(self, messages: List[Dict[str, str]], model: str = DEFAULT_MODEL,
+                       max_tokens: int = 1024, temperature: float = 0.7, use_cache: bool = True,
+                       store: bool = True) -> str:
+        """
+        Return the stripped completion text for messages.
+
+        use_cache=False skips the lookup (e.g. to get a fresh variant) but
+        still stores the new answer, so later cached calls see the latest one.
+        store=False leaves the cache untouched, for extra variants of a
+        request whose first answer is the one to keep.
+        """
+        key, cached = await self._lookup(messages, model, max_tokens, temperature, use_cache)
+        if cached is not None:
+            return cached
+
+        estimated = self._estimate(messages, max_tokens)
+        chat_completion = await self.scheduler.run(
+            lambda: self.client.chat.completions.create(
+                messages=messages,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ),
+            estimated, self.priority, model
+        )
+        usage = getattr(chat_completion, 'usage', None)
+        self.scheduler.settle(estimated, getattr(usage, 'total_tokens', None), model)
+        add_tokens(getattr(usage, 'total_tokens', None))
+        content = chat_completion.choices[0].message.content.strip()
+
+        if store and key is not None and content:
+            await asyncio.to_thread(self.cache.set, key, content)
+        return content
+
+    async def complete_task(self, task: str, messages: List[Dict[str, str]], max_tokens: int = 1024,
+                            temperature: float = 0.7, use_cache: bool = True, store: bool = True) -> str:
+        """
+        complete() on the task's model tier, escalating to larger models
+        while the output fails the task's validator
+        """
+        models = self.router.models_for(task)
+        for attempt, model in enumerate(models):
+            start = time.perf_counter()
+            content = await self.complete(messages, model=model, max_tokens=max_tokens,
+                                          temperature=temperature, use_cache=use_cache, store=store)
+            valid = self.router.validate(task, content)
+            self.router.record(task, model, time.perf_counter() - start, valid, escalated=attempt > 0)
+            if valid:
+                break
+        return content
+
+    async def stream(self, messages: List[Dict[str, str]], model: str = DEFAULT_MODEL,
+                     max_tokens: int = 1024, temperature: float = 0.7, use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        Yield the completion as text deltas while the model generates it.
+
+        A cached answer is yielded whole; a streamed one is cached once the
+        stream completes, under the same key complete() uses.
+        """
+        key, cached = await self._lookup(messages, model, max_tokens, temperature, use_cache)
+        if cached is not None:
+            yield cached
+            return
+
+        estimated = self._estimate(messages, max_tokens)
+        stream = await self.scheduler.run(
+            lambda: self.client.chat.completions.create(
+                messages=messages,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            ),
+            estimated, self.priority, model
+        )
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        content = ''.join(parts).strip()
+        used = estimated - max_tokens + estimate_tokens(content)
+        self.scheduler.settle(estimated, used, model)
+        add_tokens(used)
+        if key is not None and content:
+            await asyncio.to_thread(self.cache.set, key, content)
+
+    async def stream_task(self, task: str, messages: List[Dict[str, str]], max_tokens: int = 1024,
+                          temperature: float = 0.7, use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        stream() on the task's starting tier. The user is already reading
+        the output, so a streamed answer is validated for the stats only and
+        never escalated.
+        """
+        model = self.router.models_for(task)[0]
+        start = time.perf_counter()
+        parts = []
+        async for delta in self.stream(messages, model=model, max_tokens=max_tokens,
+                                       temperature=temperature, use_cache=use_cache):
+            parts.append(delta)
+            yield delta
+        self.router.record(task, model, time.perf_counter() - start, self.router.validate(task, ''.join(parts)))
+
+    def expected_wait(self, task: str, messages: List[Dict[str, str]], max_tokens: int = 1024, count: int = 1) -> float:
+        """
+        Seconds the rate limit would hold count such requests on the task's starting model
+        """
+        model = self.router.models_for(task)[0]
+        return self.scheduler.expected_wait(self._estimate(messages, max_tokens), count, model)
+
+    def _estimate(self, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """
+        Tokens to reserve up front: the prompt plus the whole completion budget
+        """
+        return sum(estimate_tokens(message['content']) for message in messages) + max_tokens
+
+    async def _lookup(self, messages, model, max_tokens, temperature, use_cache):
+        """
+        Return (cache key, cached answer); both None without a cache
+        """
+        if self.cache is None:
+            return None, None
+        key = self.cache.key(model, messages, temperature, max_tokens)
+        if not use_cache:
+            self.cache.record_bypass()
+            return key, None
+        return key, await asyncio.to_thread(self.cache.get, key)
+
+    def cache_stats(self) -> Optional[dict]:
+        return self.cache.stats() if self.cache is not None else None
+
+    async def aclose(self):
+        await self.client.close()
@@ -0,0 +1,127 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+# Model per tier, smallest first; escalation walks up this order
+MODEL_TIERS = {
+    'small': os.environ.get("GROQ_SMALL_MODEL", "llama3-8b-8192"),
+    'large': os.environ.get("GROQ_LARGE_MODEL", "llama3-70b-8192"),
+}
+TIER_ORDER = ('small', 'large')
+
+# Starting tier per task. Name extraction is easy for the 8B model; the
+# email is what the user actually sends, so it starts on the large one.
+TASK_TIERS = {
+    'founders': 'small',
+    'analysis': 'small',
+    'email': 'large',
+}
+
+LIST_MARKER = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s*')
+
+
+def _is_name(line: str) -> bool:
+    words = line.split()
+    return 1 <= len(words) <= 4 and all(
+        word[0].isupper() and all(char.isalpha() or char in "'-." for char in word) for word in words
+    )
+
+
+def valid_founders(text: str) -> bool:
+    """Every line is a plausible person name, or the explicit no-result answer"""
+    if "No founders identified" in text:
+        return True
+    lines = [LIST_MARKER.sub('', line).strip().strip('"') for line in text.split('\n') if line.strip()]
+    return bool(lines) and all(_is_name(line) for line in lines)
+
+
+def valid_analysis(text: str) -> bool:
+    """Follows the requested layout and says something"""
+    return 'company overview' in text.lower() and len(text.split()) >= 60
+
+
+def valid_email(text: str) -> bool:
+    """Has a subject line and a body of reasonable length"""
+    return 'subject:' in text.lower() and len(text.split()) >= 60
+
+
+VALIDATORS = {
+    'founders': valid_founders,
+    'analysis': valid_analysis,
+    'email': valid_email,
+}
+
+
+class ModelRouter:
+    """
+    Picks the model for each LLM task and decides when to escalate.
+
+    A task starts on its configured tier; if the output fails the task's
+    validator it is retried on each larger tier in turn. Latency per model
+    and escalation counts per task are recorded for tuning the tiers.
+    """
+
+    def __init__(self, task_tiers: Optional[Dict[str, str]] = None,
+                 model_tiers: Optional[Dict[str, str]] = None):
+        self.task_tiers = dict(TASK_TIERS, **(task_tiers or {}))
+        self.model_tiers = dict(MODEL_TIERS, **(model_tiers or {}))
+        self._lock = threading.Lock()
+        self._tasks = {}
+
+    def models_for(self, task: str) -> List[str]:
+        """
+        Models to try for task, starting tier first, then every larger tier
+        """
+        tier = self.task_tiers.get(task, TIER_ORDER[-1])
+        models = []
+        for name in TIER_ORDER[TIER_ORDER.index(tier):]:
+            if self.model_tiers[name] not in models:
+                models.append(self.model_tiers[name])
+        return models
+
+    def validate(self, task: str, text: str) -> bool:
+        validator = VALIDATORS.get(task)
+        return validator(text) if validator is not None else bool(text)
+
+    def record(self, task: str, model: str, latency: float, valid: bool, escalated: bool = False):
+        """
+        Record one attempt; escalated marks the attempt as a retry on a larger tier
+        """
+        with self._lock:
+            counts = self._tasks.setdefault(task, {'calls': 0, 'escalations': 0, 'invalid': 0, 'models': {}})
+            if not escalated:
+                counts['calls'] += 1
+            else:
+                counts['escalations'] += 1
+            if not valid:
+                counts['invalid'] += 1
+            model_counts = counts['models'].setdefault(model, {'calls': 0, 'latency_total': 0.0})
+            model_counts['calls'] += 1
+            model_counts['latency_total'] += latency
+
+    def stats(self) -> dict:
+        """
+        Per task: calls, escalation rate, invalid outputs and latency per model
+        """
+        with self._lock:
+            return {
+                task: {
+                    'calls': counts['calls'],
+                    'escalations': counts['escalations'],
+                    'escalation_rate': counts['escalations'] / counts['calls'] if counts['calls'] else 0.0,
+                    'invalid': counts['invalid'],
+                    'models': {
+                        model: {
+                            'calls': model_counts['calls'],
+                            'avg_latency': model_counts['latency_total'] / model_counts['calls'],
+                        }
+                        for model, model_counts in counts['models'].items()
+                    },
+                }
+                for task, counts in self._tasks.items()
+            }
+
+
+# Process-wide, so the latency and escalation stats add up every task's calls
+SHARED_ROUTER = ModelRouter()
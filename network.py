@@ -0,0 +1,380 @@
+import asyncio
+import codecs
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from progress import add_bytes
+
+# Content types worth downloading and parsing as web pages
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([a-zA-Z0-9_-]+)', re.I)
+HEADER_CHARSET_PATTERN = re.compile(r'charset=["\']?([a-zA-Z0-9_-]+)', re.I)
+
+
+def detect_encoding(head: bytes, content_type: str = '') -> str:
+    """
+    Pick a page's encoding from the Content-Type header, then a meta charset
+    in the first bytes, defaulting to UTF-8
+    """
+    for match in (HEADER_CHARSET_PATTERN.search(content_type or ''), CHARSET_PATTERN.search(head[:4096])):
+        if match:
+            encoding = match.group(1)
+            encoding = encoding.decode('ascii') if isinstance(encoding, bytes) else encoding
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                continue
+            return encoding.lower()
+    return 'utf-8'
+
+
+class FetchedPage:
+    """
+    Decoded body of a streamed page download, at most max_bytes long
+    """
+
+    def __init__(self, url: str, status_code: int, headers, text: str, bytes_read: int, truncated: bool):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self.bytes_read = bytes_read
+        self.truncated = truncated
+
+
+# getaddrinfo error codes that mean the name definitely does not exist
+NXDOMAIN_ERRORS = {socket.EAI_NONAME}
+if hasattr(socket, 'EAI_NODATA'):
+    NXDOMAIN_ERRORS.add(socket.EAI_NODATA)
+
+
+def system_resolve(host: str) -> List[str]:
+    """Resolve A/AAAA records for host using the system resolver"""
+    infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+class StaticResolver:
+    """
+    Offline resolver backed by a fixed host -> addresses mapping.
+
+    Unknown hosts raise NXDOMAIN; a delay longer than the resolver timeout
+    simulates a slow upstream.
+    """
+
+    def __init__(self, records: Dict[str, List[str]], delay: float = 0.0):
+        self.records = records
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, host: str) -> List[str]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if host not in self.records:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return self.records[host]
+
+
+class DNSCache:
+    """
+    Thread-safe in-memory cache of resolved addresses and NXDOMAIN answers
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 300):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str):
+        """
+        Return cached addresses, [] for a cached NXDOMAIN, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                return None
+            addresses, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[host]
+                return None
+            return addresses
+
+    def set(self, host: str, addresses: List[str]):
+        ttl = self.ttl if addresses else self.negative_ttl
+        with self._lock:
+            self._entries[host] = (addresses, time.time() + ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared across researcher instances so later research jobs reuse answers
+SHARED_DNS_CACHE = DNSCache()
+
+
+class HostResolver:
+    """
+    Resolve many hostnames in parallel so only live hosts get HTTP probes
+    """
+
+    def __init__(self, resolve: Optional[Callable[[str], List[str]]] = None,
+                 timeout: float = 2.0, workers: int = 16,
+                 cache: Optional[DNSCache] = None):
+        self.resolve = resolve or system_resolve
+        self.timeout = timeout
+        self.workers = max(1, workers)
+        self.cache = cache if cache is not None else SHARED_DNS_CACHE
+
+    def resolve_many(self, hosts: Iterable[str]) -> Dict[str, bool]:
+        """
+        Map each host to whether it resolved within the timeout
+        """
+        results = {}
+        pending = []
+        for host in dict.fromkeys(hosts):
+            cached = self.cache.get(host)
+            if cached is None:
+                pending.append(host)
+            else:
+                results[host] = bool(cached)
+
+        if not pending:
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=min(self.workers, len(pending)))
+        try:
+            futures = {executor.submit(self.resolve, host): host for host in pending}
+            done, not_done = wait(futures, timeout=self.timeout)
+
+            for future in done:
+                host = futures[future]
+                try:
+                    addresses = future.result()
+                except socket.gaierror as e:
+                    if e.errno in NXDOMAIN_ERRORS:
+                        self.cache.set(host, [])
+                    results[host] = False
+                    continue
+                except Exception:
+                    results[host] = False
+                    continue
+                self.cache.set(host, addresses)
+                results[host] = bool(addresses)
+
+            # Slow lookups count as unresolved for this run but are not cached
+            for future in not_done:
+                results[futures[future]] = False
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def filter_urls(self, urls: List[str]) -> List[str]:
+        """
+        Keep only URLs whose host resolves, preserving the original order
+        """
+        hosts = [urlparse(url).hostname or '' for url in urls]
+        resolved = self.resolve_many(host for host in hosts if host)
+        return [url for url, host in zip(urls, hosts) if resolved.get(host)]
+
+
+class HttpTransport:
+    """
+    Shared keep-alive async HTTP client used for every researcher network call.
+
+    Connections are pooled and reused across requests: max_connections caps
+    the pool as a whole, max_per_host caps concurrent requests to any single
+    host, and retries applies to connection errors and 502/503/504 responses.
+    An optional HttpCache (cache_store) backs fetch_text, the page download path.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, max_connections: int = 100,
+                 max_keepalive: int = 40, max_per_host: int = 10, retries: int = 1,
+                 backoff_factor: float = 0.3, timeout: float = 10, keepalive_expiry: float = 30,
+                 cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.max_per_host = max(1, max_per_host)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                retries=retries,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            ),
+        )
+        self._host_limits = {}
+        self._counts = {}
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return limit
+
+    def _count(self, host: str, index: int):
+        counts = self._counts.setdefault(host, [0, 0])
+        counts[index] += 1
+
+    def _tracer(self, host: str):
+        async def trace(event_name, info):
+            # Every new TCP connection is a handshake the pool did not save
+            if event_name == 'connection.connect_tcp.complete':
+                self._count(host, 0)
+        return trace
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        host = urlparse(url).hostname or ''
+        kwargs.setdefault('timeout', self.timeout)
+        extensions = dict(kwargs.pop('extensions', None) or {})
+        extensions['trace'] = self._tracer(host)
+
+        async with self._host_limit(host):
+            for attempt in range(self.retries + 1):
+                self._count(host, 1)
+                response = await self.client.request(method, url, extensions=extensions, **kwargs)
+                add_bytes(response.num_bytes_downloaded)
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.retries:
+                    return response
+                await response.aclose()
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+        return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('HEAD', url, **kwargs)
+
+    async def fetch_text(self, url: str, max_bytes: int = 2_000_000,
+                         content_types=HTML_CONTENT_TYPES, **kwargs) -> Optional[FetchedPage]:
+        """
+        Stream a page and decode it as it arrives, reading at most max_bytes.
+
+        Returns None without reading the body when the response declares a
+        content type outside content_types (PDFs, images, JS bundles...).
+        With a cache attached, fresh pages are served from disk and stale
+        ones are revalidated with If-None-Match / If-Modified-Since. Cache
+        reads and writes run in worker threads: the SQLite file may be
+        locked by another instance and bodies can be megabytes, and the
+        event loop must keep serving the other requests meanwhile.
+        """
+        host = urlparse(url).hostname or ''
+        kwargs.setdefault('timeout', self.timeout)
+        extensions = dict(kwargs.pop('extensions', None) or {})
+        extensions['trace'] = self._tracer(host)
+
+        entry = await asyncio.to_thread(self.cache.lookup, url) if self.cache is not None else None
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.record_hit(entry)
+                return self._cached_page(entry)
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.conditional_headers(entry)}
+
+        async with self._host_limit(host):
+            for attempt in range(self.retries + 1):
+                self._count(host, 1)
+                async with self.client.stream('GET', url, extensions=extensions, **kwargs) as response:
+                    if response.status_code in self.RETRY_STATUSES and attempt < self.retries:
+                        await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                        continue
+
+                    if response.status_code == 304 and entry is not None:
+                        entry = await asyncio.to_thread(self.cache.refresh, url, entry, response.headers)
+                        return self._cached_page(entry)
+
+                    content_type = response.headers.get('content-type', '')
+                    if content_type and not any(allowed in content_type.lower() for allowed in content_types):
+                        return None
+
+                    text, bytes_read, truncated = await self._read_capped(response, max_bytes, content_type)
+                    add_bytes(bytes_read)
+                    if self.cache is not None:
+                        self.cache.record_miss()
+                        # A truncated body is not the resource, so never store it
+                        if not truncated:
+                            await asyncio.to_thread(self.cache.store_response, url, str(response.url),
+                                                    response.status_code, response.headers, text, bytes_read)
+                    return FetchedPage(str(response.url), response.status_code, response.headers,
+                                       text, bytes_read, truncated)
+
+    def _cached_page(self, entry: dict) -> FetchedPage:
+        return FetchedPage(entry['url'], entry['status_code'], entry['headers'],
+                           entry['text'], entry['bytes_read'], False)
+
+    async def _read_capped(self, response: httpx.Response, max_bytes: int, content_type: str):
+        """
+        Read and incrementally decode a streamed body, stopping at max_bytes
+        """
+        parts = []
+        head = b''
+        decoder = None
+        bytes_read = 0
+        truncated = False
+
+        async for chunk in response.aiter_bytes():
+            if bytes_read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - bytes_read]
+                truncated = True
+            bytes_read += len(chunk)
+
+            if decoder is None:
+                # Buffer just enough to find a meta charset before decoding
+                head += chunk
+                if len(head) >= 1024 or truncated:
+                    decoder = codecs.getincrementaldecoder(detect_encoding(head, content_type))(errors='replace')
+                    parts.append(decoder.decode(head))
+            else:
+                parts.append(decoder.decode(chunk))
+
+            if truncated:
+                break
+
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(detect_encoding(head, content_type))(errors='replace')
+            parts.append(decoder.decode(head))
+        # A cut-off multi-byte character at the cap is dropped, not replaced
+        if not truncated:
+            parts.append(decoder.decode(b'', final=True))
+
+        return ''.join(parts), bytes_read, truncated
+
+    def stats(self) -> dict:
+        """
+        Connection reuse counters: every new connection costs a TCP (and TLS)
+        handshake, every other request reused a pooled connection
+        """
+        per_host = {host: list(counts) for host, counts in self._counts.items()}
+        connections = sum(counts[0] for counts in per_host.values())
+        requests_made = sum(counts[1] for counts in per_host.values())
+        return {
+            'requests': requests_made,
+            'connections': connections,
+            'reused': max(requests_made - connections, 0),
+            'reuse_rate': max(requests_made - connections, 0) / requests_made if requests_made else 0.0,
+            'hosts': {host: {'requests': r, 'connections': c} for host, (c, r) in per_host.items()},
+            'cache': self.cache.stats() if self.cache is not None else None,
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
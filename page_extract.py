@@ -0,0 +1,132 @@
+import re
+from typing import Dict, Union
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from network import detect_encoding
+
+# Subtrees whose text never counts as page content
+SKIP_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header'])
+
+ABOUT_CLASS = re.compile(r'about|mission|vision|story', re.I)
+PRODUCT_CLASS = re.compile(r'product|service|solution|feature', re.I)
+
+# Minimum stripped length for a block to be kept
+MIN_LENGTHS = {'about': 50, 'products': 30, 'main_content': 20}
+
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+_parsers = {}
+_text_parser = etree.HTMLParser(remove_comments=True)
+
+
+def _parser_for(content: bytes) -> etree.HTMLParser:
+    """
+    HTML parser for the page's declared charset, defaulting to UTF-8
+    instead of libxml2's Latin-1
+    """
+    encoding = detect_encoding(content)
+    parser = _parsers.get(encoding)
+    if parser is None:
+        parser = _parsers[encoding] = etree.HTMLParser(encoding=encoding, remove_comments=True)
+    return parser
+
+
+def extract_sections(content: Union[bytes, str]) -> Dict:
+    """
+    Extract title, meta description, about/product/paragraph text blocks and
+    link targets from a page in a single traversal of the lxml tree.
+
+    Blocks are returned in document order, matching what the earlier
+    BeautifulSoup find_all passes produced. Links are collected from the
+    whole page, including nav/header/footer which are excluded from text.
+    content may be raw bytes or text already decoded while streaming.
+    """
+    sections = {
+        'title': '',
+        'description': '',
+        'about': [],
+        'products': [],
+        'main_content': [],
+        'links': []
+    }
+    if not content or not content.strip():
+        return sections
+
+    try:
+        if isinstance(content, str):
+            # lxml refuses decoded text that still declares an encoding
+            root = lxml_html.document_fromstring(XML_DECLARATION.sub('', content, count=1), parser=_text_parser)
+        else:
+            root = lxml_html.document_fromstring(content, parser=_parser_for(content))
+    except (etree.ParserError, ValueError):
+        return sections
+
+    title_done = False
+    description_done = False
+    skip_depth = 0
+    # Open blocks: [element, field, slot index, text parts]
+    open_blocks = []
+
+    def add_text(text):
+        for block in open_blocks:
+            block[3].append(text)
+
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue
+
+        if event == 'start':
+            if tag == 'a':
+                href = element.get('href')
+                if href:
+                    sections['links'].append(href)
+
+            if skip_depth or tag in SKIP_TAGS:
+                skip_depth += 1
+                continue
+
+            if tag == 'meta' and not description_done and element.get('name') == 'description':
+                sections['description'] = (element.get('content') or '').strip()
+                description_done = True
+            elif tag == 'title' and not title_done:
+                open_blocks.append([element, 'title', None, []])
+            elif tag in ('section', 'div'):
+                classes = element.get('class')
+                if classes:
+                    for field, pattern in (('about', ABOUT_CLASS), ('products', PRODUCT_CLASS)):
+                        if pattern.search(classes):
+                            # Reserve the slot now so nested blocks keep document order
+                            sections[field].append(None)
+                            open_blocks.append([element, field, len(sections[field]) - 1, []])
+            elif tag == 'p':
+                sections['main_content'].append(None)
+                open_blocks.append([element, 'main_content', len(sections['main_content']) - 1, []])
+
+            if element.text:
+                add_text(element.text)
+
+        else:
+            if skip_depth:
+                skip_depth -= 1
+                if skip_depth:
+                    continue
+            else:
+                while open_blocks and open_blocks[-1][0] is element:
+                    _, field, slot, parts = open_blocks.pop()
+                    text = ''.join(parts).strip()
+                    if field == 'title':
+                        sections['title'] = text
+                        title_done = True
+                    elif len(text) > MIN_LENGTHS[field]:
+                        sections[field][slot] = text
+
+            # The tail follows the closed element inside its parent
+            if element.tail:
+                add_text(element.tail)
+
+    for field in MIN_LENGTHS:
+        sections[field] = [text for text in sections[field] if text is not None]
+    return sections
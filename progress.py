@@ -0,0 +1,114 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+STARTED = 'started'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+# Receiver and subject (company name) of the events of the running task.
+# Context variables follow asyncio tasks, so concurrent companies in a
+# batch report to their own handler with their own counters.
+_reporter = ContextVar('progress_reporter', default=None)
+# Counters of the innermost running stage
+_meter = ContextVar('progress_meter', default=None)
+
+
+@contextmanager
+def reporting(handler: Optional[Callable[[Dict], None]], subject: str = ''):
+    """Send the events of stages run inside this block to handler"""
+    token = _reporter.set((handler, subject) if handler is not None else None)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+def add_bytes(count: int):
+    """Charge downloaded bytes to the running stage (and the stages around it)"""
+    meter = _meter.get()
+    while meter is not None:
+        meter['bytes'] += count
+        meter = meter['parent']
+
+
+def add_tokens(count: Optional[int]):
+    """Charge LLM tokens to the running stage (and the stages around it)"""
+    meter = _meter.get()
+    while meter is not None and count:
+        meter['tokens'] += count
+        meter = meter['parent']
+
+
+def set_detail(detail: str):
+    """Short outcome of the running stage, e.g. the website found"""
+    meter = _meter.get()
+    if meter is not None:
+        meter['detail'] = detail
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Report the enclosed work as a stage: a started event now, then a
+    finished (or failed) event with elapsed ms and the bytes and tokens
+    charged to it. Does nothing outside a reporting() block.
+    """
+    reporter = _reporter.get()
+    if reporter is None:
+        yield
+        return
+
+    handler, subject = reporter
+    meter = {'bytes': 0, 'tokens': 0, 'detail': None, 'parent': _meter.get()}
+    token = _meter.set(meter)
+    start = time.perf_counter()
+    handler(_event(subject, name, STARTED, 0.0, meter))
+    status = FAILED
+    try:
+        yield
+        status = FINISHED
+    finally:
+        _meter.reset(token)
+        handler(_event(subject, name, status, (time.perf_counter() - start) * 1000, meter))
+
+
+def tracked(name: str, describe: Optional[Callable[[object], str]] = None):
+    """
+    Decorator running an async method as a stage() called name;
+    describe(result), if given, becomes the finished event's detail
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with stage(name):
+                result = await func(*args, **kwargs)
+                if describe is not None:
+                    set_detail(describe(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def _event(subject: str, name: str, status: str, elapsed_ms: float, meter: dict) -> Dict:
+    return {
+        'company': subject,
+        'stage': name,
+        'status': status,
+        'elapsed_ms': round(elapsed_ms, 1),
+        'bytes': meter['bytes'],
+        'tokens': meter['tokens'],
+        'detail': meter['detail'],
+    }
+
+
+def format_event(event: Dict) -> str:
+    """One log line for an event"""
+    line = f"[{event['company']}] {event['stage']} {event['status']}"
+    if event['status'] != STARTED:
+        line += f" in {event['elapsed_ms']:.0f} ms ({event['bytes'] / 1024:.0f} KB, {event['tokens']} tokens)"
+        if event['detail']:
+            line += f": {event['detail']}"
+    return line
@@ -0,0 +1,74 @@
+import math
+import re
+from typing import Dict, Tuple
+
+# Fields of the scraped website content, most important first. When the
+# budget runs out, lower-priority fields are cut before higher ones.
+FIELD_PRIORITY = ('description', 'title', 'about', 'products', 'main_content')
+
+# Rough characters-per-token ratio of the Llama 3 tokenizer on English prose
+CHARS_PER_TOKEN = 4
+
+WHITESPACE = re.compile(r'\s+')
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'(])')
+DEDUPE_STRIP = re.compile(r'[\W_]+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate, close enough to size a prompt against a budget"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces, tabs and newlines into single spaces"""
+    return WHITESPACE.sub(' ', text or '').strip()
+
+
+def split_sentences(text: str):
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text) if sentence]
+
+
+def compact_website_content(content: Dict[str, str], token_budget: int = 2000) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Shrink scraped website content to fit token_budget.
+
+    Whitespace is normalized, sentences already seen in a higher-priority
+    field (or earlier in the same field) are dropped, and fields are filled
+    in FIELD_PRIORITY order until the budget is spent; the sentence that
+    crosses the budget is cut at a word boundary. Returns the compacted
+    content and a report with tokens_before, tokens_after and token_budget.
+    """
+    tokens_before = sum(estimate_tokens(content.get(field) or '') for field in FIELD_PRIORITY)
+
+    compacted = {field: '' for field in FIELD_PRIORITY}
+    seen = set()
+    remaining = token_budget
+
+    for field in FIELD_PRIORITY:
+        if remaining <= 0:
+            break
+        kept = []
+        for sentence in split_sentences(normalize_whitespace(content.get(field) or '')):
+            key = DEDUPE_STRIP.sub(' ', sentence.lower()).strip()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+
+            # +1 for the joining space
+            cost = estimate_tokens(sentence) + 1
+            if cost > remaining:
+                head = sentence[:(remaining - 1) * CHARS_PER_TOKEN]
+                if ' ' in head:
+                    kept.append(head.rsplit(' ', 1)[0] + '...')
+                remaining = 0
+                break
+            kept.append(sentence)
+            remaining -= cost
+        compacted[field] = ' '.join(kept)
+
+    report = {
+        'tokens_before': tokens_before,
+        'tokens_after': sum(estimate_tokens(text) for text in compacted.values()),
+        'token_budget': token_budget,
+    }
+    return compacted, report
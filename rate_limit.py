@@ -0,0 +1,278 @@
+import asyncio
+import itertools
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import groq
+
+# Priority lanes: lower numbers are admitted first
+INTERACTIVE = 0
+BATCH = 1
+LANE_NAMES = {INTERACTIVE: 'interactive', BATCH: 'batch'}
+
+# Groq budgets every model separately: (requests, tokens) per minute on the
+# free tier. Models not listed get the scheduler's default limits.
+FREE_TIER_LIMITS = {
+    'llama3-8b-8192': (30, 30000),
+    'llama3-70b-8192': (30, 6000),
+}
+
+# Errors worth retrying after a pause; anything else goes straight to the caller
+RETRYABLE_ERRORS = (groq.RateLimitError, groq.InternalServerError, groq.APIConnectionError)
+
+
+class TokenBucket:
+    """
+    Budget of `capacity` units per minute, refilled continuously
+    """
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.rate = capacity / 60.0
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Seconds until amount units are available (0 if they are now)
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return max(amount - self.tokens, 0) / self.rate
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def give_back(self, amount: float):
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ModelBudget:
+    """
+    Request and token buckets of one model, plus its 429 pause
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+
+    def wait_time(self, estimated_tokens: int, now: float) -> float:
+        return max(self.paused_until - now, self.requests.wait_time(1, now),
+                   self.tokens.wait_time(estimated_tokens, now))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay requested by a Retry-After header on an API error, if any"""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class GroqScheduler:
+    """
+    Process-wide admission control for Groq requests.
+
+    Every request first waits for room in its model's requests-per-minute
+    and tokens-per-minute buckets; Groq budgets each model separately, so
+    8B calls never wait behind a drained 70B budget. Waiting requests for
+    one model are admitted strictly by lane (interactive before batch),
+    then in arrival order. A 429 pauses that model's admissions for the
+    Retry-After delay (or an exponential backoff), with jitter so queued
+    requests do not retry in lockstep.
+
+    The scheduler is thread-safe and not bound to one event loop, so the
+    Streamlit app and batch runs can share it.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, requests_per_minute: int = 30, tokens_per_minute: int = 6000,
+                 max_retries: int = 4, base_delay: float = 1.0, max_delay: float = 60.0,
+                 model_limits: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.model_limits = dict(model_limits or {})
+        self._budgets = {}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._lanes = {lane: {'requests': 0, 'wait_total': 0.0, 'wait_max': 0.0} for lane in LANE_NAMES}
+        self._retries = 0
+        self._rate_limited = 0
+
+    def _budget(self, model: str) -> ModelBudget:
+        budget = self._budgets.get(model)
+        if budget is None:
+            limits = self.model_limits.get(model, (self.requests_per_minute, self.tokens_per_minute))
+            budget = self._budgets[model] = ModelBudget(*limits)
+        return budget
+
+    def _first_waiting(self, model: str):
+        return min(ticket for ticket in self._waiting if ticket[2] == model)
+
+    async def acquire(self, estimated_tokens: int, priority: int = INTERACTIVE, model: str = ''):
+        """
+        Wait until this request may be sent and charge it to its model's buckets
+        """
+        ticket = (priority, next(self._sequence), model)
+        start = time.monotonic()
+        with self._lock:
+            self._waiting.append(ticket)
+
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    if self._first_waiting(model) == ticket:
+                        budget = self._budget(model)
+                        delay = budget.wait_time(estimated_tokens, now)
+                        if delay <= 0:
+                            self._waiting.remove(ticket)
+                            budget.requests.take(1)
+                            budget.tokens.take(estimated_tokens)
+                            self._record_wait(priority, now - start)
+                            return
+                    else:
+                        delay = self.POLL_INTERVAL
+                await asyncio.sleep(min(max(delay, self.POLL_INTERVAL), 1.0))
+        except BaseException:
+            with self._lock:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+            raise
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int], model: str = ''):
+        """
+        Correct the model's token bucket once the real usage of a request is known
+        """
+        if actual_tokens is None:
+            return
+        with self._lock:
+            tokens = self._budget(model).tokens
+            if actual_tokens < estimated_tokens:
+                tokens.give_back(estimated_tokens - actual_tokens)
+            else:
+                tokens.take(actual_tokens - estimated_tokens)
+
+    def expected_wait(self, estimated_tokens: int, count: int = 1, model: str = '') -> float:
+        """
+        Seconds until count requests of estimated_tokens each would all be
+        admitted for model, counting requests already queued for it. An
+        upper bound: settle() usually hands back part of each reservation.
+        """
+        with self._lock:
+            now = time.monotonic()
+            budget = self._budget(model)
+            queued = sum(1 for ticket in self._waiting if ticket[2] == model)
+            requests = count + queued
+            # Queued requests are assumed to be the same size as these ones
+            tokens = requests * min(estimated_tokens, budget.tokens.capacity)
+            budget.requests._refill(now)
+            budget.tokens._refill(now)
+            return max(
+                budget.paused_until - now,
+                max(requests - budget.requests.tokens, 0) / budget.requests.rate,
+                max(tokens - budget.tokens.tokens, 0) / budget.tokens.rate,
+                0.0,
+            )
+
+    async def run(self, call: Callable[[], Awaitable], estimated_tokens: int, priority: int = INTERACTIVE,
+                  model: str = ''):
+        """
+        Admit and run call() against model's budget, retrying rate limits and transient API errors
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(estimated_tokens, priority, model)
+            try:
+                return await call()
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                self._backoff(e, attempt, model)
+
+    def _backoff(self, error: Exception, attempt: int, model: str = ''):
+        delay = retry_after_seconds(error)
+        if delay is None:
+            delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+        delay += random.uniform(0, delay * 0.25 + 0.1)
+        with self._lock:
+            self._retries += 1
+            budget = self._budget(model)
+            if isinstance(error, groq.RateLimitError):
+                self._rate_limited += 1
+                # The server says this model is over budget: stop all its requests, not just this one
+                budget.paused_until = max(budget.paused_until, time.monotonic() + delay)
+                budget.requests.tokens = 0
+            else:
+                budget.paused_until = max(budget.paused_until, time.monotonic() + delay / 2)
+
+    def _record_wait(self, priority: int, waited: float):
+        lane = self._lanes.setdefault(priority, {'requests': 0, 'wait_total': 0.0, 'wait_max': 0.0})
+        lane['requests'] += 1
+        lane['wait_total'] += waited
+        lane['wait_max'] = max(lane['wait_max'], waited)
+
+    def stats(self) -> dict:
+        """
+        Queue depth per lane, admission wait times, retry counters and the
+        remaining budget of every model used so far
+        """
+        with self._lock:
+            now = time.monotonic()
+            queued = [priority for priority, _, _ in self._waiting]
+            lanes = {
+                LANE_NAMES.get(lane, str(lane)): {
+                    'queued': queued.count(lane),
+                    'requests': counts['requests'],
+                    'avg_wait': counts['wait_total'] / counts['requests'] if counts['requests'] else 0.0,
+                    'max_wait': counts['wait_max'],
+                }
+                for lane, counts in self._lanes.items()
+            }
+            return {
+                'queued': len(self._waiting),
+                'lanes': lanes,
+                'retries': self._retries,
+                'rate_limited': self._rate_limited,
+                'paused_for': max([budget.paused_until - now for budget in self._budgets.values()] + [0]),
+                'models': {
+                    model: {
+                        'tokens_per_minute': budget.tokens.capacity,
+                        'tokens_available': round(budget.tokens.tokens),
+                        'paused_for': max(budget.paused_until - now, 0),
+                    }
+                    for model, budget in self._budgets.items()
+                },
+            }
+
+
+# Groq limits the whole API key, so every caller in the process draws from one budget.
+# Defaults follow Groq's free tier per model; GROQ_REQUESTS_PER_MINUTE and
+# GROQ_TOKENS_PER_MINUTE, when set, apply to every model (paid keys).
+_CUSTOM_LIMITS = "GROQ_REQUESTS_PER_MINUTE" in os.environ or "GROQ_TOKENS_PER_MINUTE" in os.environ
+SHARED_SCHEDULER = GroqScheduler(
+    requests_per_minute=int(os.environ.get("GROQ_REQUESTS_PER_MINUTE", 30)),
+    tokens_per_minute=int(os.environ.get("GROQ_TOKENS_PER_MINUTE", 6000)),
+    model_limits=None if _CUSTOM_LIMITS else FREE_TIER_LIMITS,
+)
@@ -0,0 +1,244 @@
+import io
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+import pdfplumber
+
+from cache_store import ResumeCache
+from prompt_compaction import CHARS_PER_TOKEN, estimate_tokens
+
+# Heading text (lowercased, punctuation stripped) -> section kind
+SECTION_KINDS = {
+    'summary': 'summary', 'profile': 'summary', 'objective': 'summary', 'about me': 'summary',
+    'experience': 'experience', 'work experience': 'experience', 'professional experience': 'experience',
+    'employment': 'experience', 'internships': 'experience', 'internship experience': 'experience',
+    'projects': 'projects', 'personal projects': 'projects', 'academic projects': 'projects',
+    'key projects': 'projects', 'selected projects': 'projects',
+    'skills': 'skills', 'technical skills': 'skills', 'core skills': 'skills', 'technologies': 'skills',
+    'skills and tools': 'skills', 'tools and technologies': 'skills',
+    'education': 'education', 'academics': 'education',
+    'publications': 'publications', 'research': 'publications', 'research experience': 'experience',
+    'certifications': 'achievements', 'achievements': 'achievements', 'awards': 'achievements',
+    'honors and awards': 'achievements', 'leadership': 'achievements', 'extracurricular activities': 'achievements',
+    'positions of responsibility': 'achievements', 'activities': 'achievements',
+}
+# Kept in full whatever the job: who the candidate is and what they know
+ALWAYS_KEEP = ('header', 'skills')
+
+BULLET = re.compile(r'^\s*[•●▪◦·\-–*]\s*')
+HEADING_CLEAN = re.compile(r'[^a-z ]+')
+TERM = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9]+)*')
+STOP_TERMS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it', 'its',
+    'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'was', 'we', 'will', 'with', 'you', 'your',
+))
+
+
+def read_pdf(data: bytes) -> Dict:
+    """
+    Extract text and per-page metadata from PDF bytes.
+
+    Pages without a text layer (scans, images) contribute no text instead
+    of failing the whole resume.
+    """
+    parts = []
+    pages = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for number, page in enumerate(pdf.pages, start=1):
+            text = page.extract_text() or ''
+            parts.append(text)
+            pages.append({'number': number, 'chars': len(text), 'words': len(text.split())})
+    return {
+        'text': '\n'.join(parts).strip(),
+        'pages': pages,
+        'page_count': len(pages),
+        'bytes': len(data),
+    }
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms for lexical matching, keeping tech tokens like c++, c#, node.js, scikit-learn"""
+    return [term for term in TERM.findall(text.lower()) if term not in STOP_TERMS]
+
+
+def _section_kind(line: str) -> Optional[str]:
+    """
+    Section kind if line is a heading: a known title, in any case, on its own line
+    """
+    stripped = line.strip().rstrip(':')
+    if not stripped or len(stripped) > 40:
+        return None
+    return SECTION_KINDS.get(' '.join(HEADING_CLEAN.sub(' ', stripped.lower().replace('&', 'and')).split()))
+
+
+def build_profile(text: str) -> Dict:
+    """
+    Split resume text into sections and the entries inside them.
+
+    Lines before the first recognized heading form the 'header' section
+    (name, contact links). Inside a section, a non-bullet line that follows
+    bullets starts a new entry, so every project or job becomes its own
+    block with its bullets. Also lists skill terms and experience bullets.
+    """
+    sections = [{'title': '', 'kind': 'header', 'blocks': [[]]}]
+    previous_bullet = False
+
+    for line in text.split('\n'):
+        if not line.strip():
+            continue
+        kind = _section_kind(line)
+        if kind is not None:
+            sections.append({'title': line.strip().rstrip(':'), 'kind': kind, 'blocks': [[]]})
+            previous_bullet = False
+            continue
+
+        is_bullet = bool(BULLET.match(line))
+        blocks = sections[-1]['blocks']
+        if not is_bullet and previous_bullet and sections[-1]['kind'] != 'skills':
+            blocks.append([])
+        blocks[-1].append(line.strip())
+        previous_bullet = is_bullet
+
+    for section in sections:
+        section['blocks'] = ['\n'.join(lines) for lines in section['blocks'] if lines]
+    sections = [section for section in sections if section['blocks']]
+
+    def section_lines(kind):
+        return [line for section in sections if section['kind'] == kind
+                for block in section['blocks'] for line in block.split('\n')]
+
+    skills = []
+    for line in section_lines('skills'):
+        # "Languages: Python, C++" -> Python, C++
+        for skill in re.split(r'[,;|•]', line.split(':', 1)[-1]):
+            if skill.strip() and skill.strip() not in skills:
+                skills.append(skill.strip())
+
+    return {
+        'sections': sections,
+        'skills': skills,
+        'projects': [block for section in sections if section['kind'] == 'projects' for block in section['blocks']],
+        'experience_bullets': [BULLET.sub('', line) for line in section_lines('experience') if BULLET.match(line)],
+    }
+
+
+def _bm25_scores(documents: List[List[str]], query: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Okapi BM25 score of each tokenized document against the query terms"""
+    if not documents:
+        return []
+    average_length = sum(len(doc) for doc in documents) / len(documents) or 1
+    document_frequency = Counter(term for doc in documents for term in set(doc))
+    query_terms = Counter(query)
+
+    scores = []
+    for doc in documents:
+        frequencies = Counter(doc)
+        score = 0.0
+        for term, query_count in query_terms.items():
+            frequency = frequencies.get(term)
+            if not frequency:
+                continue
+            idf = math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            score += query_count * idf * frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * len(doc) / average_length))
+        scores.append(score)
+    return scores
+
+
+def _split_block(block: str, limit: int) -> List[str]:
+    """block cut between lines (bullets) into pieces of about limit tokens at most"""
+    if estimate_tokens(block) <= limit:
+        return [block]
+    pieces, lines = [], []
+    for line in block.split('\n'):
+        if lines and estimate_tokens('\n'.join(lines + [line])) > limit:
+            pieces.append('\n'.join(lines))
+            lines = []
+        lines.append(line)
+    pieces.append('\n'.join(lines))
+    return pieces
+
+
+def _truncate(text: str, token_budget: int) -> str:
+    """text cut at a word boundary to fit token_budget"""
+    if estimate_tokens(text) <= token_budget:
+        return text
+    head = text[:token_budget * CHARS_PER_TOKEN]
+    return head.rsplit(None, 1)[0] if len(head.split()) > 1 else head
+
+
+def select_resume_sections(profile: Dict, query: str, token_budget: int = 600) -> str:
+    """
+    Resume text trimmed to the blocks most relevant to query (JD or company analysis).
+
+    The header and skills are always kept. Other blocks (jobs, projects,
+    education entries...) are ranked with BM25 against the query and added
+    best first until token_budget is reached; budget left over is filled
+    with the unmatched blocks in resume order. Blocks over half the budget
+    are split between lines first, so a resume without recognizable
+    headings (all 'header') is ranked line by line. Sections come out
+    ordered by their best block and blocks by score, so the most relevant
+    project leads. A resume that already fits the budget is returned
+    unchanged, and one nothing can be picked from is cut to the budget.
+    """
+    sections = profile.get('sections', [])
+    full_text = '\n\n'.join(
+        '\n'.join(([section['title']] if section['title'] else []) + section['blocks']) for section in sections
+    )
+    if estimate_tokens(full_text) <= token_budget:
+        return full_text
+
+    kept = {index for index, section in enumerate(sections) if section['kind'] in ALWAYS_KEEP
+            and sum(estimate_tokens(block) for block in section['blocks']) <= token_budget // 4}
+
+    candidates = [(index, piece) for index, section in enumerate(sections)
+                  if index not in kept for block in section['blocks']
+                  for piece in _split_block(block, token_budget // 2)]
+    scores = _bm25_scores([tokenize(block) for _, block in candidates], tokenize(query))
+
+    chosen = {index: [] for index, section in enumerate(sections)}
+    remaining = token_budget
+    for index in kept:
+        chosen[index] = [(float('inf'), block) for block in sections[index]['blocks']]
+        remaining -= sum(estimate_tokens(block) for block in sections[index]['blocks'])
+
+    # Best match first; the sort is stable, so unmatched blocks follow in resume order
+    for score, (index, block) in sorted(zip(scores, candidates), key=lambda item: item[0], reverse=True):
+        cost = estimate_tokens(block)
+        if cost > remaining:
+            continue
+        chosen[index].append((score, block))
+        remaining -= cost
+
+    def best_score(index):
+        return max(score for score, _ in chosen[index])
+
+    parts = []
+    for index in sorted((i for i in chosen if chosen[i]), key=lambda i: (-best_score(i), i)):
+        section = sections[index]
+        blocks = [block for _, block in sorted(chosen[index], key=lambda item: item[0], reverse=True)]
+        parts.append('\n'.join(([section['title']] if section['title'] else []) + blocks))
+    return '\n\n'.join(parts) or _truncate(full_text, token_budget)
+
+
+def ingest_resume(data: bytes, cache: Optional[ResumeCache] = None) -> Dict:
+    """
+    Parsed resume for the given file bytes, parsing each distinct file once.
+
+    The result holds the text, page metadata and the structured profile
+    from build_profile, plus the content hash under 'sha256' so callers can
+    key derived data (scores, selections) on it.
+    """
+    key = ResumeCache.key(data)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None and 'profile' in cached:
+            return cached
+
+    parsed = read_pdf(data)
+    parsed['sha256'] = key
+    parsed['profile'] = build_profile(parsed['text'])
+    if cache is not None:
+        cache.set(key, parsed)
+    return parsed
@@ -0,0 +1,228 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Dict, List, Optional, Set
+
+from docx import Document
+
+# Fields a prompt template may use, and the ones it must use to be worth sending
+PROMPT_FIELDS = ('resume_text', 'company_info', 'jd_text', 'email_template')
+REQUIRED_PROMPT_FIELDS = ('resume_text', 'jd_text')
+
+PROMPT = 'prompt'
+EMAIL = 'email'
+TEMPLATE_EXTENSIONS = ('.txt', '.docx')
+
+BUILTIN_PROMPT = """
+    You are an expert cold email writer. Write a professional, compelling cold email for a job application.
+
+    RESUME CONTENT:
+    {resume_text}
+
+    COMPANY RESEARCH:
+    {company_info}
+
+    JOB DESCRIPTION:
+    {jd_text}
+
+    EMAIL TEMPLATE (if provided):
+    {email_template}
+
+    IMPORTANT INSTRUCTIONS:
+    - Write ONLY the email content - no introductory text, no explanations
+    - Start with "SUBJECT:" followed by a compelling, creative subject line
+    - Do not include phrases like "Here is a cold email" or "Below is the email"
+    - Make the subject line engaging and specific to the company/role
+    - Write in clear, well-structured paragraphs
+    - Each paragraph should focus on one main point
+    - Use proper spacing between paragraphs
+    - Keep it professional but conversational
+    - Include specific technical skills that match the role
+    - End with a clear call-to-action
+
+    Format EXACTLY like this example:
+    SUBJECT: Driving AI Innovation at [Company Name] - [Your Value Proposition]
+
+    Hi [Company] Team,
+
+    [Opening paragraph - express interest and connection to company]
+
+    [Second paragraph - highlight relevant experience and achievements]
+
+    [Third paragraph - explain why you're a good fit and what you can contribute]
+
+    [Closing paragraph - call to action]
+
+    Best regards,
+    [Candidate Name]
+
+    Remember:
+    - Create compelling, specific subject lines
+    - Write in clear paragraphs with proper spacing
+    - Make each paragraph focused and purposeful
+    - Keep the tone professional yet personable
+    """
+
+
+class TemplateError(ValueError):
+    """A template that cannot be read or would not format into a usable prompt"""
+
+
+def docx_text(data: bytes) -> str:
+    """Non-empty paragraphs of a DOCX file, one per line"""
+    try:
+        doc = Document(io.BytesIO(data))
+    except Exception as e:
+        raise TemplateError(f"could not read DOCX template: {e}") from e
+    return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
+
+
+def template_fields(text: str) -> Set[str]:
+    """Names of the {placeholders} in a format string"""
+    try:
+        return {field for _, field, _, _ in Formatter().parse(text) if field is not None}
+    except ValueError as e:
+        raise TemplateError(f"unbalanced braces: {e}") from e
+
+
+def validate_prompt(text: str, name: str = 'prompt'):
+    """Raise TemplateError unless text formats with PROMPT_FIELDS and uses the required ones"""
+    fields = template_fields(text)
+    missing = [field for field in REQUIRED_PROMPT_FIELDS if field not in fields]
+    if missing:
+        raise TemplateError(f"{name} is missing {', '.join('{' + field + '}' for field in missing)}")
+    unknown = sorted(field or '{}' for field in fields if field not in PROMPT_FIELDS)
+    if unknown:
+        raise TemplateError(f"{name} has unknown placeholders: {', '.join(unknown)} "
+                            f"(escape literal braces as {{{{ and }}}})")
+
+
+def validate_email_template(text: str, name: str = 'email template'):
+    if not text.strip():
+        raise TemplateError(f"{name} has no text")
+
+
+class TemplateRegistry:
+    """
+    Named prompt and email templates, each read, parsed and validated once.
+
+    Prompts are prompt.txt (as 'default', falling back to the built-in
+    prompt) plus any prompts/*.txt; email templates are templates/*.txt and
+    templates/*.docx, named after the file. A file is re-read only when its
+    mtime or size changes, and parsed text is kept by content hash, so
+    re-saving an unchanged file or uploading the same DOCX again costs a
+    hash, not a parse.
+    """
+
+    def __init__(self, base_dir: str, max_parsed: int = 64):
+        self.base_dir = base_dir
+        self.max_parsed = max_parsed
+        self._lock = threading.Lock()
+        self._files = {}
+        self._parsed = OrderedDict()
+        self._builtin = {PROMPT: {'builtin': BUILTIN_PROMPT}, EMAIL: {}}
+        self._loads = 0
+        self._parses = 0
+        validate_prompt(BUILTIN_PROMPT, 'builtin')
+
+    def _paths(self, kind: str) -> Dict[str, str]:
+        if kind == PROMPT:
+            paths = {'default': os.path.join(self.base_dir, 'prompt.txt')}
+            directory, extensions = os.path.join(self.base_dir, 'prompts'), ('.txt',)
+        else:
+            paths = {}
+            directory, extensions = os.path.join(self.base_dir, 'templates'), TEMPLATE_EXTENSIONS
+        try:
+            entries = sorted(os.listdir(directory))
+        except OSError:
+            entries = []
+        for entry in entries:
+            stem, extension = os.path.splitext(entry)
+            if extension.lower() in extensions and not entry.startswith(('.', '~$')):
+                paths.setdefault(stem, os.path.join(directory, entry))
+        return {name: path for name, path in paths.items() if os.path.isfile(path)}
+
+    def names(self, kind: str = PROMPT) -> List[str]:
+        """
+        Template names of kind, files first, then built-ins
+        """
+        names = list(self._paths(kind))
+        return names + [name for name in self._builtin[kind] if name not in names]
+
+    def get(self, name: str, kind: str = PROMPT) -> str:
+        """
+        Validated text of a named template.
+
+        'default' falls back to the built-in prompt when prompt.txt is
+        missing. Raises KeyError for unknown names and TemplateError for
+        templates that fail validation.
+        """
+        path = self._paths(kind).get(name)
+        if path is None:
+            if name in self._builtin[kind]:
+                return self._builtin[kind][name]
+            if kind == PROMPT and name == 'default':
+                return BUILTIN_PROMPT
+            raise KeyError(f"no {kind} template named {name!r}")
+
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise TemplateError(f"could not read {path}: {e}") from e
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and (entry['mtime'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+                return entry['text']
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        text = self.parse(os.path.basename(path), data, kind, name)
+        with self._lock:
+            self._loads += 1
+            self._files[path] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'text': text}
+        return text
+
+    def parse(self, filename: str, data: bytes, kind: str = EMAIL, name: Optional[str] = None) -> str:
+        """
+        Text of a template file's bytes (.txt or .docx), validated for kind
+        and cached by content hash. Used for uploads as well as files.
+        """
+        key = (kind, hashlib.sha256(data).hexdigest())
+        with self._lock:
+            if key in self._parsed:
+                self._parsed.move_to_end(key)
+                return self._parsed[key]
+
+        if filename.lower().endswith('.docx'):
+            text = docx_text(data)
+        else:
+            try:
+                text = data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                raise TemplateError(f"{filename} is not UTF-8 text") from e
+
+        if kind == PROMPT:
+            validate_prompt(text, name or filename)
+        else:
+            validate_email_template(text, name or filename)
+
+        with self._lock:
+            self._parses += 1
+            self._parsed[key] = text
+            while len(self._parsed) > self.max_parsed:
+                self._parsed.popitem(last=False)
+        return text
+
+    def stats(self) -> dict:
+        """
+        Files (re)loaded from disk and templates actually parsed
+        """
+        with self._lock:
+            return {'loads': self._loads, 'parses': self._parses, 'cached': len(self._parsed)}
+
+
+# Shared by the app and batch runs; templates live next to this module
+SHARED_TEMPLATES = TemplateRegistry(os.path.dirname(os.path.abspath(__file__)))
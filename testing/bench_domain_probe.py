@@ -0,0 +1,105 @@
+"""
+Benchmark worst-case domain probing latency against a local stand-in server.
+
+Every candidate domain is mapped to a path on a local HTTP server that waits
+DELAY seconds before answering, mimicking slow or dead hosts. The sequential
+baseline (probe_workers=1) is compared with the concurrent prober, and a
+fake resolver shows the effect of the DNS pre-filter.
+
+Run from the repository root:
+    python testing/bench_domain_probe.py
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_research import AsyncCompanyResearcher, run_sync
+from network import DNSCache, HostResolver, HttpTransport, StaticResolver
+
+DELAY = 0.3
+HIT_PATHS = set()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        time.sleep(DELAY)
+        self.send_response(200 if self.path in HIT_PATHS else 404)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def resolve_everything(host):
+    return ["127.0.0.1"]
+
+
+class LocalResearcher(AsyncCompanyResearcher):
+    def __init__(self, base_url: str, probe_workers: int, resolve=resolve_everything):
+        resolver = HostResolver(resolve, cache=DNSCache())
+        # Every candidate hits the same local host, so lift the per-host cap
+        transport = HttpTransport(max_per_host=16, retries=0)
+        super().__init__("benchmark-key", probe_workers=probe_workers,
+                         resolver=resolver, transport=transport)
+        self.base_url = base_url
+
+    async def _probe_url(self, url: str) -> bool:
+        return await super()._probe_url(f"{self.base_url}/{urlparse(url).netloc}")
+
+
+def run(base_url: str, workers: int, company_name: str, resolve=resolve_everything):
+    researcher = LocalResearcher(base_url, workers, resolve)
+    start = time.perf_counter()
+    result = run_sync(researcher._try_common_domains(company_name))
+    elapsed = time.perf_counter() - start
+    run_sync(researcher.aclose())
+    return elapsed, result
+
+
+def main():
+    global HIT_PATHS
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    company_name = "Acme Robotics"
+
+    print(f"Stand-in server at {base_url}, {DELAY:.2f}s per response\n")
+
+    HIT_PATHS = set()
+    print("Worst case (no candidate answers):")
+    for workers in (1, 6, 14):
+        elapsed, result = run(base_url, workers, company_name)
+        print(f"  probe_workers={workers:<3} {elapsed:6.2f}s  result={result}")
+
+    HIT_PATHS = {"/acme-robotics.io"}
+    print("\nLate hit (only acme-robotics.io answers):")
+    for workers in (1, 6, 14):
+        elapsed, result = run(base_url, workers, company_name)
+        print(f"  probe_workers={workers:<3} {elapsed:6.2f}s  result={result}")
+
+    # Priority must hold when several candidates answer
+    HIT_PATHS = {"/www.acmerobotics.io", "/acme-robotics.com"}
+    print("\nPriority (www.acmerobotics.io and acme-robotics.com answer):")
+    for workers in (1, 6, 14):
+        elapsed, result = run(base_url, workers, company_name)
+        assert result == "https://www.acmerobotics.io", result
+        print(f"  probe_workers={workers:<3} {elapsed:6.2f}s  result={result}")
+
+    # Only two candidates exist in DNS; the rest never reach HTTP
+    HIT_PATHS = {"/acme-robotics.io"}
+    resolve = StaticResolver({"www.acmerobotics.com": ["127.0.0.1"], "acme-robotics.io": ["127.0.0.1"]})
+    print("\nDNS pre-filter (2 of 14 candidates resolve):")
+    for workers in (1, 6):
+        elapsed, result = run(base_url, workers, company_name, resolve)
+        print(f"  probe_workers={workers:<3} {elapsed:6.2f}s  result={result}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
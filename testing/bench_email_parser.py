@@ -0,0 +1,176 @@
+"""
+Check and benchmark of the email post-processing (email_parser.py).
+
+testing/email_outputs.jsonl holds model outputs with the subject and body
+parse_email must produce for each, written or checked by hand. Rows with
+"source": "synthetic" are hand-built shapes (preambles, markdown subjects,
+labels, missing subject) over a few sample emails; rows with "source":
+"groq" are real completions saved by testing/capture_email_outputs.py.
+Only rows marked "reviewed": true are checked, reporting each source
+separately; captured rows wait until someone has read them. The script
+then times parse_email against the clean-up and parsing code that used to
+run inline in cold_outreach.main() (copied below as legacy_parse), and
+lists the outputs where the two disagree. A disagreement is not a
+failure: it is where the rewrite changed behavior.
+
+Run from the repository root:
+    python testing/bench_email_parser.py [--verbose]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from email_parser import parse_email
+
+OUTPUTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "email_outputs.jsonl")
+
+
+def legacy_parse(email_content, company_name):
+    """The inline parser from cold_outreach.main() before email_parser.py, unchanged"""
+    def clean_email_content(content):
+        content = re.sub(r'Here is a cold email.*?:', '', content, flags=re.IGNORECASE)
+        content = re.sub(r'Below is.*?email.*?:', '', content, flags=re.IGNORECASE)
+        content = re.sub(r'I.*?generated.*?email.*?:', '', content, flags=re.IGNORECASE)
+        content = re.sub(r'Based on.*?information.*?:', '', content, flags=re.IGNORECASE)
+        content = re.sub(r'Here.*?personalized.*?email.*?:', '', content, flags=re.IGNORECASE)
+        content = re.sub(r'^\s*Here.*?:\s*', '', content, flags=re.MULTILINE | re.IGNORECASE)
+        content = re.sub(r'^\s*Below.*?:\s*', '', content, flags=re.MULTILINE | re.IGNORECASE)
+        content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+        content = content.strip()
+        return content
+
+    email_content = clean_email_content(email_content)
+    subject_part = ""
+    body_part = ""
+
+    if "SUBJECT:" in email_content:
+        lines = email_content.split('\n')
+        subject_line = ""
+        body_lines = []
+        found_subject = False
+        skip_next_empty = False
+
+        for line in lines:
+            line_stripped = line.strip()
+            if line_stripped.startswith("SUBJECT:") and not found_subject:
+                subject_line = line_stripped.replace("SUBJECT:", "").strip()
+                found_subject = True
+                skip_next_empty = True
+            elif found_subject:
+                if skip_next_empty and not line_stripped:
+                    skip_next_empty = False
+                    continue
+                if line_stripped:
+                    body_lines.append(line_stripped)
+                else:
+                    body_lines.append("")
+
+        subject_part = subject_line if subject_line else f"Application for position at {company_name}"
+        body_part = '\n'.join(body_lines).strip()
+
+        if not subject_line:
+            for line in lines:
+                line_stripped = line.strip()
+                if line_stripped.lower().startswith("subject"):
+                    if ":" in line_stripped:
+                        potential_subject = line_stripped.split(":", 1)[1].strip()
+                        if potential_subject and len(potential_subject) > 5:
+                            subject_part = potential_subject
+                            break
+    else:
+        subject_part = f"Application for position at {company_name}"
+        body_part = email_content
+
+        lines = email_content.split('\n')
+        for i, line in enumerate(lines):
+            line_stripped = line.strip()
+            if line_stripped.lower().startswith("subject"):
+                if ":" in line_stripped:
+                    potential_subject = line_stripped.split(":", 1)[1].strip()
+                    if potential_subject and len(potential_subject) > 5:
+                        subject_part = potential_subject
+                        remaining_lines = lines[i+1:]
+                        body_part = '\n'.join(remaining_lines).strip()
+                        break
+
+    body_part = clean_email_content(body_part)
+    body_part = re.sub(r'EMAIL BODY:\s*', '', body_part, flags=re.IGNORECASE)
+    body_part = re.sub(r'^\s*Email:\s*', '', body_part, flags=re.MULTILINE | re.IGNORECASE)
+    body_part = re.sub(r'^\s*Subject:.*$', '', body_part, flags=re.MULTILINE | re.IGNORECASE)
+
+    if body_part:
+        paragraphs = body_part.split('\n\n')
+        formatted_paragraphs = []
+        for para in paragraphs:
+            if para.strip():
+                clean_para = para.replace('\n', ' ').strip()
+                clean_para = re.sub(r'\s+', ' ', clean_para)
+                if clean_para:
+                    formatted_paragraphs.append(clean_para)
+        body_part = '\n\n'.join(formatted_paragraphs)
+
+    return subject_part, body_part
+
+
+def parse(row):
+    subject, body, _ = parse_email(row["raw"], f"Application for position at {row['company_name']}")
+    return subject, body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--outputs", default=OUTPUTS)
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the corpus per timing")
+    parser.add_argument("--verbose", action="store_true", help="show every output that differs from legacy")
+    args = parser.parse_args()
+
+    with open(args.outputs, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    reviewed = [row for row in rows if row.get("reviewed")]
+    failures = [row["id"] for row in reviewed if parse(row) != (row["subject"], row["body"])]
+    sources = sorted({row.get("source", "synthetic") for row in rows})
+    changed = [row for row in rows if legacy_parse(row["raw"], row["company_name"]) != parse(row)]
+
+    def best_of(function):
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for row in rows:
+                    function(row)
+            best = min(best, time.perf_counter() - start)
+        return best / (args.repeat * len(rows))
+
+    new_time = best_of(parse)
+    legacy_time = best_of(lambda row: legacy_parse(row["raw"], row["company_name"]))
+
+    print(f"outputs:             {len(rows)} ({len(rows) - len(reviewed)} awaiting review, not checked)")
+    for source in sources:
+        ids = [row["id"] for row in reviewed if row.get("source", "synthetic") == source]
+        print(f"  {source + ':':<18} {len(ids)} checked ({sum(row_id in failures for row_id in ids)} failed)")
+    if "groq" not in sources:
+        print("  no captured Groq completions yet; add some with testing/capture_email_outputs.py")
+    print(f"failed:              {len(failures)}{' (' + ', '.join(failures) + ')' if failures else ''}")
+    print(f"differs from legacy: {len(changed)} ({', '.join(row['id'] for row in changed)})")
+    print(f"parse_email:         {new_time * 1e6:.1f} us per email")
+    print(f"legacy:              {legacy_time * 1e6:.1f} us per email ({legacy_time / new_time:.1f}x slower)")
+
+    if args.verbose:
+        for row in changed:
+            legacy = legacy_parse(row["raw"], row["company_name"])
+            print(f"\n--- {row['id']}\nlegacy subject: {legacy[0]!r}\nnew subject:    {row['subject']!r}")
+            if legacy[1] != row["body"]:
+                print(f"legacy body: {legacy[1]!r}\nnew body:    {row['body']!r}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Microbenchmark: single-pass lxml extractor vs. the original BeautifulSoup
+html.parser implementation of scrape_website_content.
+
+Without saved pages the script builds a fixed set of synthetic company
+marketing pages (seeded, so every checkout benchmarks identical bytes):
+a Next.js landing page with a large __NEXT_DATA__ payload, a Webflow-style
+site with deeply nested grids, a WordPress corporate site with
+about/services sections and a long careers page, each with the inline
+CSS, analytics scripts, nav, header and footer real sites carry.
+    python testing/bench_extract.py
+
+To benchmark real sites instead, save them into testing/pages/ (ignored by
+git) and they are used in place of the synthetic set:
+    python testing/bench_extract.py --fetch https://stripe.com https://www.notion.so
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_extract import extract_sections
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def legacy_extract(content: bytes) -> dict:
+    """The pre-lxml extraction from scrape_website_content, kept for comparison"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+
+    result = {'title': '', 'description': '', 'about': [], 'products': [], 'main_content': []}
+
+    title_tag = soup.find('title')
+    if title_tag:
+        result['title'] = title_tag.get_text().strip()
+
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc:
+        result['description'] = meta_desc.get('content', '').strip()
+
+    for section in soup.find_all(['section', 'div'], class_=re.compile(r'about|mission|vision|story', re.I)):
+        text = section.get_text().strip()
+        if len(text) > 50:
+            result['about'].append(text)
+
+    for section in soup.find_all(['section', 'div'], class_=re.compile(r'product|service|solution|feature', re.I)):
+        text = section.get_text().strip()
+        if len(text) > 30:
+            result['products'].append(text)
+
+    for p in soup.find_all('p'):
+        text = p.get_text().strip()
+        if len(text) > 20:
+            result['main_content'].append(text)
+
+    return result
+
+
+def fetch_pages(urls):
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for url in urls:
+        response = requests.get(url, headers=HEADERS, timeout=20)
+        name = re.sub(r'[^a-z0-9]+', '_', urlparse(url).netloc.lower()).strip('_')
+        with open(os.path.join(PAGES_DIR, f"{name}.html"), "wb") as f:
+            f.write(response.content)
+        print(f"saved {url} ({len(response.content) / 1024:.0f} KB)")
+
+
+WORDS = (
+    "platform teams data customers workflow secure cloud analytics automate insights scale "
+    "enterprise developers integrate real-time pipeline reliable faster growth revenue modern "
+    "collaboration product launch global partners compliance infrastructure intelligent simple "
+    "dashboard api reporting onboarding support mission story values people build trusted"
+).split()
+
+
+def sentence(rng: random.Random, low: int = 8, high: int = 22) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng: random.Random, sentences: int = 3) -> str:
+    return " ".join(sentence(rng) for _ in range(sentences))
+
+
+def synthetic_page(company: str, style: str, seed: int, products: int, script_kb: int) -> bytes:
+    """A marketing page in one of the layouts sites are commonly built with"""
+    rng = random.Random(seed)
+    css = "".join(f".c{i}{{margin:{i % 9}px;padding:{i % 7}px;color:#{i * 2654435761 % 0xffffff:06x}}}"
+                  for i in range(script_kb * 12))
+    analytics = "window.dataLayer=window.dataLayer||[];" + "".join(
+        f"dataLayer.push({{'event':'e{i}','value':{i}}});" for i in range(script_kb * 16))
+    links = "".join(f'<li><a href="/{slug}">{slug.title()}</a></li>'
+                    for slug in ("product", "solutions", "pricing", "about", "careers", "blog", "contact"))
+    head = (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+            f'<title>{company} | {sentence(rng, 4, 7)[:-1]}</title>'
+            f'<meta name="description" content="{sentence(rng, 14, 24)}">'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f'<style>{css}</style><script>{analytics}</script></head>')
+    header = f'<header class="site-header"><a href="/" class="logo">{company}</a><nav><ul>{links}</ul></nav></header>'
+    footer = (f'<footer><div class="footer-grid"><ul>{links}</ul><p>{paragraph(rng, 1)}</p>'
+              f'<p>&copy; 2024 {company}, Inc. All rights reserved.</p></div></footer>')
+
+    cards = []
+    for i in range(products):
+        features = "".join(f"<li>{sentence(rng, 4, 9)}</li>" for _ in range(rng.randint(3, 6)))
+        if style == "webflow":
+            cards.append(f'<div class="w-layout-grid product-grid"><div class="w-col w-col-6"><div class="product-card">'
+                         f'<div class="card-inner"><h3>{rng.choice(WORDS).title()} {i}</h3><p>{paragraph(rng, 2)}</p>'
+                         f'<ul class="feature-list">{features}</ul></div></div></div></div>')
+        else:
+            cards.append(f'<div class="product-card"><h3>{rng.choice(WORDS).title()} {i}</h3>'
+                         f'<p>{paragraph(rng, 2)}</p><ul>{features}</ul><a href="/product/{i}">Learn more</a></div>')
+
+    about = (f'<section class="about-us"><h2>Our story</h2><div class="mission-statement"><p>{paragraph(rng, 4)}</p></div>'
+             f'<div class="values">{"".join(f"<p>{paragraph(rng, 2)}</p>" for _ in range(3))}</div></section>')
+    hero = f'<section class="hero"><h1>{sentence(rng, 5, 9)}</h1><p>{paragraph(rng, 2)}</p><a class="button" href="/demo">Book a demo</a></section>'
+    quotes = "".join(f'<blockquote><p>{paragraph(rng, 2)}</p><cite>{rng.choice(WORDS).title()} Corp</cite></blockquote>'
+                     for _ in range(4))
+    main = f'{hero}<section class="solutions">{"".join(cards)}</section>{about}<section class="testimonials">{quotes}</section>'
+
+    if style == "nextjs":
+        data = {"props": {"pageProps": {"sections": [{"id": i, "body": paragraph(rng, 3)} for i in range(script_kb * 2)]}}}
+        body = (f'<body><div id="__next">{header}<main>{main}</main>{footer}</div>'
+                f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></body>')
+    elif style == "wordpress":
+        jobs = "".join(f'<article class="job-listing"><h3>{rng.choice(WORDS).title()} Engineer</h3><p>{paragraph(rng, 3)}</p></article>'
+                       for _ in range(products * 3))
+        body = (f'<body class="home page-template"><div id="page" class="site">{header}'
+                f'<div id="content" class="site-content"><div class="entry-content">{main}'
+                f'<section class="services-overview"><div class="service-item"><p>{paragraph(rng, 3)}</p></div></section>'
+                f'<section class="careers">{jobs}</section></div></div>{footer}</div></body>')
+    else:
+        body = f'<body><div class="page-wrapper">{header}<main class="main-wrapper">{main}</main>{footer}</div></body>'
+    return (head + body + "</html>").encode("utf-8")
+
+
+# (file name, company, layout, product cards, KB of inline script/CSS)
+SYNTHETIC_PAGES = [
+    ("acme_analytics_nextjs.html", "Acme Analytics", "nextjs", 6, 120),
+    ("brightpath_webflow.html", "Brightpath", "webflow", 12, 40),
+    ("northwind_wordpress.html", "Northwind Logistics", "wordpress", 8, 60),
+    ("orbital_ai_landing.html", "Orbital AI", "landing", 4, 20),
+    ("helix_health_nextjs.html", "Helix Health", "nextjs", 20, 300),
+    ("quarry_cloud_webflow.html", "Quarry Cloud", "webflow", 30, 150),
+]
+
+
+def load_pages():
+    """(name, bytes) of the saved pages in testing/pages, else the synthetic set"""
+    files = sorted(f for f in os.listdir(PAGES_DIR) if f.endswith(".html")) if os.path.isdir(PAGES_DIR) else []
+    if not files:
+        return "synthetic", [(name, synthetic_page(company, style, seed, products, script_kb))
+                             for seed, (name, company, style, products, script_kb) in enumerate(SYNTHETIC_PAGES)]
+    pages = []
+    for name in files:
+        with open(os.path.join(PAGES_DIR, name), "rb") as f:
+            pages.append((name, f.read()))
+    return PAGES_DIR, pages
+
+
+def normalize(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def agreement(old: dict, new: dict) -> str:
+    """Share of legacy blocks the new extractor reproduces (whitespace-insensitive)"""
+    matched = total = 0
+    for field in ('about', 'products', 'main_content'):
+        new_blocks = {normalize(text) for text in new[field]}
+        for text in old[field]:
+            total += 1
+            matched += normalize(text) in new_blocks
+    fields_equal = all(normalize(old[f]) == normalize(new[f]) for f in ('title', 'description'))
+    return f"{matched}/{total} blocks, title/description {'equal' if fields_equal else 'DIFFER'}"
+
+
+def best_of(func, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fetch", nargs="+", metavar="URL", help="download pages into testing/pages first")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_pages(args.fetch)
+
+    source, pages = load_pages()
+    print(f"pages: {source}")
+
+    total_old = total_new = 0.0
+    print(f"{'page':<28}{'size':>8}{'bs4 (ms)':>11}{'lxml (ms)':>11}{'speedup':>9}  agreement")
+    for name, content in pages:
+        old_time = best_of(legacy_extract, content, args.repeat)
+        new_time = best_of(extract_sections, content, args.repeat)
+        total_old += old_time
+        total_new += new_time
+        print(f"{name[:27]:<28}{len(content) / 1024:>6.0f}KB{old_time * 1000:>11.1f}{new_time * 1000:>11.1f}"
+              f"{old_time / new_time:>8.1f}x  {agreement(legacy_extract(content), extract_sections(content))}")
+
+    print(f"{'total':<36}{total_old * 1000:>11.1f}{total_new * 1000:>11.1f}{total_old / total_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
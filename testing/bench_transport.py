@@ -0,0 +1,85 @@
+"""
+Compare connection handshakes with and without the pooled HTTP transport.
+
+A local keep-alive HTTP/1.1 server is hit REQUESTS times, once from WORKERS
+threads through module-level requests.get (a fresh connection per call) and
+once with WORKERS concurrent requests through a shared HttpTransport.
+
+Run from the repository root:
+    python testing/bench_transport.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network import HttpTransport
+
+REQUESTS = 200
+WORKERS = 8
+BODY = b"<html><body><p>ok</p></body></html>"
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        KeepAliveHandler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_requests(url):
+    KeepAliveHandler.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        list(executor.map(lambda _: requests.get(url, timeout=5), range(REQUESTS)))
+    return time.perf_counter() - start, KeepAliveHandler.connections
+
+
+async def run_transport(transport, url):
+    KeepAliveHandler.connections = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(transport.get(url, timeout=5) for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    await transport.aclose()
+    return elapsed, KeepAliveHandler.connections
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    elapsed, connections = run_requests(url)
+    print(f"requests.get    {elapsed:6.2f}s  server-side connections={connections}")
+
+    transport = HttpTransport(max_per_host=WORKERS)
+    elapsed, connections = asyncio.run(run_transport(transport, url))
+    print(f"HttpTransport   {elapsed:6.2f}s  server-side connections={connections}")
+    stats = transport.stats()
+    print(f"  transport stats: requests={stats['requests']} connections={stats['connections']} "
+          f"reuse_rate={stats['reuse_rate']:.1%}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
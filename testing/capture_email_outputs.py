@@ -0,0 +1,130 @@
+"""
+Capture real Groq email completions into testing/email_outputs.jsonl.
+
+The rows the corpus started with are hand-built shapes ("source":
+"synthetic"); this script adds actual model output ("source": "groq"), so
+bench_email_parser.py checks parse_email against what Groq really writes.
+Emails are generated exactly as the app's research mode does: the same
+prompt and system message, the resume sections matching each company, and
+the company analysis from a batch_research.py results file. The response
+cache is bypassed, so every row is a fresh completion.
+
+New rows are written with "reviewed": false and the current parser's
+subject and body as a starting point; bench_email_parser.py skips them.
+Read each one, correct subject and body to what the email really says,
+then set "reviewed" to true: only then is the row checked.
+
+Run from the repository root (needs network access and a Groq key):
+    python testing/capture_email_outputs.py --resume resume.pdf --research research_results.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.logger import set_log_level
+
+from cold_outreach import build_email_messages
+from email_parser import parse_email
+from llm_client import GroqChat
+from model_router import SHARED_ROUTER
+from resume_parser import ingest_resume, select_resume_sections
+
+OUTPUTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "email_outputs.jsonl")
+
+
+def research_rows(path, limit):
+    """Companies with an analysis from a batch_research.py output file"""
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line) if line.strip() else {}
+            if record.get("analysis") and not record.get("error"):
+                rows.append(record)
+                if len(rows) == limit:
+                    break
+    return rows
+
+
+async def capture(chat, model, jobs, count):
+    """[(company_name, completion or exception)] for count completions of every (company_name, messages) job"""
+    try:
+        captured = []
+        for company_name, messages in jobs:
+            results = await asyncio.gather(*(chat.complete(messages, model=model, max_tokens=1024, temperature=0.7,
+                                                           use_cache=False)
+                                             for _ in range(count)), return_exceptions=True)
+            captured.extend((company_name, result) for result in results)
+        return captured
+    finally:
+        await chat.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", required=True, help="PDF resume to write the emails from")
+    parser.add_argument("--research", required=True, help="JSONL results of batch_research.py")
+    parser.add_argument("--per-company", type=int, default=2, help="completions captured per company")
+    parser.add_argument("--limit", type=int, default=10, help="companies to use")
+    parser.add_argument("--prompt", default="default", help="prompt template name, as in the app")
+    parser.add_argument("--outputs", default=OUTPUTS)
+    parser.add_argument("--groq-api-key", default=os.environ.get("GROQ_API_KEY"), help="defaults to $GROQ_API_KEY")
+    args = parser.parse_args()
+    set_log_level("error")
+
+    if not args.groq_api_key:
+        parser.error("a Groq API key is required (--groq-api-key or GROQ_API_KEY)")
+
+    with open(args.resume, "rb") as f:
+        profile = ingest_resume(f.read())["profile"]
+    with open(args.outputs, "r", encoding="utf-8") as f:
+        existing = {json.loads(line)["id"] for line in f if line.strip()}
+
+    jobs = []
+    for record in research_rows(args.research, args.limit):
+        company_name = record["company_name"]
+        company_info = f"Company: {company_name}\nWebsite: {record.get('website_url')}\n\nAnalysis:\n{record['analysis']}"
+        jd_text = record.get("jd_text") or f"Position at {company_name} - based on company research"
+        resume_text = select_resume_sections(profile, f"{jd_text}\n{company_info}")
+        jobs.append((company_name, build_email_messages(resume_text, company_info, jd_text, "", args.prompt)))
+
+    model = SHARED_ROUTER.models_for("email")[0]
+    results = asyncio.run(capture(GroqChat(args.groq_api_key), model, jobs, args.per_company))
+    captured = failed = 0
+    with open(args.outputs, "a", encoding="utf-8") as out:
+        for company_name, result in results:
+            if not isinstance(result, str):
+                failed += 1
+                print(f"{company_name}: {result}", file=sys.stderr)
+                continue
+            number = 0
+            while f"groq-{company_name}-{number}" in existing:
+                number += 1
+            row_id = f"groq-{company_name}-{number}"
+            existing.add(row_id)
+            subject, body, _ = parse_email(result, f"Application for position at {company_name}")
+            out.write(json.dumps({
+                "id": row_id,
+                "source": "groq",
+                "reviewed": False,
+                "model": model,
+                "prompt": args.prompt,
+                "captured_at": time.strftime("%Y-%m-%d"),
+                "company_name": company_name,
+                "raw": result,
+                "subject": subject,
+                "body": body,
+            }, ensure_ascii=False) + "\n")
+            captured += 1
+
+    print(f"captured {captured} completions from {model} ({failed} failed) -> {args.outputs}")
+    print("correct subject/body of the new rows by hand and set \"reviewed\": true to have them checked")
+
+
+if __name__ == "__main__":
+    main()
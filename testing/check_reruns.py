@@ -0,0 +1,139 @@
+"""
+Counts the expensive calls the Streamlit app makes across reruns.
+
+Runs cold_outreach.py headless with Streamlit's AppTest, starting from a
+generated email in session state, then types into the Recipient and
+Subject fields the way a user would: every keystroke is a full rerun of
+main(). Parsing the email, building Groq clients or researchers, opening
+caches and scanning them for stats must each happen at most once however
+many reruns follow. Exits non-zero if any count grows.
+
+No network access or real API key is needed. Run from the repository root:
+    python testing/check_reruns.py [--reruns 20]
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+import async_research
+import cache_store
+import email_parser
+import llm_client
+
+GENERATED_EMAIL = """Here is a cold email for Fincepta:
+
+SUBJECT: Graph analytics for smarter leads
+
+Hi Fincepta Team,
+
+I'm building a graph-based analyzer for non-numeric financial data that surfaces leads from filings.
+
+It would map well onto your lead scoring work.
+
+Best,
+Ayush"""
+
+calls = Counter()
+
+
+def counting(name, function):
+    def wrapper(*args, **kwargs):
+        calls[name] += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=20, help="simulated keystrokes after the first run")
+    args = parser.parse_args()
+    set_log_level("error")
+
+    patches = [
+        mock.patch.object(email_parser, "parse_email", counting("parse_email", email_parser.parse_email)),
+        mock.patch.object(cache_store.SQLiteCache, "__init__",
+                          counting("cache opened", cache_store.SQLiteCache.__init__)),
+        mock.patch.object(cache_store.SQLiteCache, "stats", counting("cache stats", cache_store.SQLiteCache.stats)),
+        mock.patch.object(llm_client.GroqChat, "__init__", counting("GroqChat", llm_client.GroqChat.__init__)),
+        mock.patch.object(async_research.AsyncCompanyResearcher, "__init__",
+                          counting("researcher", async_research.AsyncCompanyResearcher.__init__)),
+    ]
+    for patch in patches:
+        patch.start()
+
+    app = AppTest.from_file(os.path.join(ROOT, "cold_outreach.py"), default_timeout=30)
+    app.secrets["GROQ_API_KEY"] = "gsk_test"
+    app.session_state["manual_mode"] = {
+        'resume_file': None,
+        'company_name': "Fincepta",
+        'jd_text': "ML intern working on graph analytics",
+        'analysis': "Job opportunity at Fincepta",
+        'email_template_file': None,
+    }
+    app.session_state["generated_email"] = GENERATED_EMAIL
+    app.run()
+    if app.exception:
+        sys.exit(f"app raised: {app.exception[0].message}")
+    first_run = Counter(calls)
+
+    recipient = next(widget for widget in app.text_input if "Recipient" in widget.label)
+    subject = next(widget for widget in app.text_input if widget.label == "Subject Line")
+    if subject.value != "Graph analytics for smarter leads":
+        sys.exit(f"unexpected parsed subject: {subject.value!r}")
+
+    typed = "founder@fincepta.com"
+    for i in range(args.reruns):
+        if i % 2:
+            subject.set_value(subject.value + "!")
+        else:
+            recipient.set_value(typed[:i + 1])
+        app.run()
+        if app.exception:
+            sys.exit(f"app raised on rerun {i + 1}: {app.exception[0].message}")
+
+    rerun_calls = Counter(calls)
+
+    # Research and email clicks go through the cached factories; the first
+    # click builds the clients, later ones must reuse them (AppTest cannot
+    # click without network access, so call the factories directly)
+    import cold_outreach
+
+    def click():
+        cold_outreach.shared_researcher("gsk_test")
+        cold_outreach.shared_groq_chat("gsk_test", cold_outreach.shared_caches()['llm'])
+
+    click()
+    first_click = Counter(calls)
+    for _ in range(4):
+        click()
+
+    for patch in patches:
+        patch.stop()
+
+    print(f"{'call':<16} {'first run':>9} {'after ' + str(args.reruns) + ' reruns':>18}")
+    grew = []
+    for name in ("parse_email", "cache opened", "cache stats", "GroqChat", "researcher"):
+        print(f"{name:<16} {first_run[name]:>9} {rerun_calls[name]:>18}")
+        if rerun_calls[name] > first_run[name]:
+            grew.append(name)
+    for name in ("GroqChat", "researcher"):
+        built = first_click[name] - rerun_calls[name]
+        print(f"{name + ' built':<16} {built:>9} {calls[name] - rerun_calls[name]:>18}  (first click, after 5 clicks)")
+        if calls[name] > first_click[name]:
+            grew.append(name)
+
+    if grew:
+        sys.exit(f"repeated on rerun: {', '.join(sorted(set(grew)))}")
+    print("ok: reruns with unchanged inputs did no parsing or client construction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Checks that select_resume_sections always gives the email prompt a resume.
+
+Builds profiles with build_profile from generated resumes longer than the
+token budget: one with the usual headings, one without any heading (all
+'header'), one that is a single long block, and the usual one against a
+query sharing no word with it. Each selection must be non-empty, fit the
+budget and use most of it, and the project the query matches must be in
+it. Exits non-zero if any case fails.
+
+No network access or PDF is needed. Run from the repository root:
+    python testing/check_resume_selection.py [--budget 600]
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from prompt_compaction import estimate_tokens
+from resume_parser import build_profile, select_resume_sections
+
+HEADER = "Ayush Sharma\nayush@example.com | github.com/ayush | +91 98765 43210"
+SKILLS = "Skills\nLanguages: Python, C++, SQL\nTools: PyTorch, Docker, Git"
+PROJECTS = [
+    ("Graph Lead Finder", "graph analytics over company filings to surface sales leads"),
+    ("Crop Yield Forecaster", "satellite imagery and weather series to predict harvests"),
+    ("Realtime Chat Server", "websocket backend handling ten thousand concurrent users"),
+    ("Invoice OCR Pipeline", "scanned invoices turned into structured ledger entries"),
+    ("Music Recommender", "listening history factorized into playlist suggestions"),
+    ("Traffic Signal Simulator", "agent based simulation of city intersections"),
+]
+JOBS = [
+    ("Data Intern, Fintrack", "built dashboards tracking loan defaults for the risk team"),
+    ("Backend Intern, Shoplane", "moved order processing to a queue and cut checkout latency"),
+]
+
+
+def entry(title, summary, bullets=4):
+    lines = [title] + [f"• {summary}, iteration {i + 1} with measured results and written notes" for i in range(bullets)]
+    return "\n".join(lines)
+
+
+def with_headings():
+    return "\n".join([HEADER, SKILLS, "Projects"] + [entry(*p) for p in PROJECTS]
+                     + ["Experience"] + [entry(*j) for j in JOBS]
+                     + ["Education", "B.Tech Computer Science, 2021-2025"])
+
+
+def without_headings():
+    return "\n".join([HEADER] + [entry(*p) for p in PROJECTS] + [entry(*j) for j in JOBS])
+
+
+def one_block():
+    return "\n".join([HEADER] + [line for p in PROJECTS for line in entry(*p).split("\n")[1:]])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=int, default=600, help="token budget given to select_resume_sections")
+    args = parser.parse_args()
+
+    matching = "Looking for an intern to work on graph analytics of company filings for sales leads"
+    unrelated = "Zookeeper wanted: feed penguins, clean enclosures, lead visitor tours"
+    cases = [
+        ("headings, matching query", with_headings(), matching, "Graph Lead Finder"),
+        ("headings, unrelated query", with_headings(), unrelated, None),
+        ("no headings, matching query", without_headings(), matching, "Graph Lead Finder"),
+        ("one long block", one_block(), matching, "graph analytics"),
+    ]
+
+    failures = []
+    print(f"{'case':<28} {'resume':>7} {'selected':>9}  includes")
+    for name, text, query, expected_lead in cases:
+        resume_tokens = estimate_tokens(text)
+        selected = select_resume_sections(build_profile(text), query, args.budget)
+        tokens = estimate_tokens(selected)
+        lead = next((line for line in selected.split("\n") if expected_lead and expected_lead in line), "")
+        print(f"{name:<28} {resume_tokens:>7} {tokens:>9}  {lead[:40]!r}")
+
+        if resume_tokens <= args.budget:
+            failures.append(f"{name}: resume of {resume_tokens} tokens does not exceed the budget")
+        elif not selected.strip():
+            failures.append(f"{name}: empty selection")
+        elif tokens > args.budget * 1.1:
+            failures.append(f"{name}: {tokens} tokens is over the {args.budget} budget")
+        elif tokens < args.budget * 0.7:
+            failures.append(f"{name}: only {tokens} of {args.budget} tokens used")
+        elif expected_lead and not lead:
+            failures.append(f"{name}: {expected_lead!r} was not selected")
+
+    if failures:
+        sys.exit("\n".join(failures))
+    print("ok: every selection is non-empty and fills the budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Offline evaluation of the rule-based founder extractor (founder_rules.py).
+
+Every snippet in testing/founder_snippets.jsonl is labeled with the
+founders it names. For each one the rules either answer (and skip the LLM)
+or return nothing (and find_founders falls back to the LLM). Reports
+precision and recall of the answered snippets and the share of LLM calls
+the rules avoid.
+
+Run from the repository root:
+    python testing/eval_founders.py [--verbose]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from founder_rules import extract_founders
+
+SNIPPETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "founder_snippets.jsonl")
+
+
+def load_snippets(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snippets", default=SNIPPETS)
+    parser.add_argument("--verbose", action="store_true", help="print every snippet's result")
+    args = parser.parse_args()
+
+    rows = load_snippets(args.snippets)
+    true_positives = false_positives = false_negatives = 0
+    answered = wrong_answers = 0
+    missed_by_rules = 0
+
+    start = time.perf_counter()
+    for row in rows:
+        predicted = extract_founders(row["text"], row["company_name"])
+        expected = {name.lower() for name in row["founders"]}
+
+        if predicted:
+            answered += 1
+            got = {name.lower() for name in predicted}
+            true_positives += len(got & expected)
+            false_positives += len(got - expected)
+            false_negatives += len(expected - got)
+            wrong_answers += bool(got - expected)
+        elif expected:
+            missed_by_rules += 1
+
+        if args.verbose:
+            mark = "LLM " if not predicted else ("ok  " if {n.lower() for n in predicted} == expected else "DIFF")
+            print(f"{mark} {row['company_name']:<14} predicted={predicted} expected={row['founders']}")
+    elapsed = time.perf_counter() - start
+
+    precision = true_positives / (true_positives + false_positives) if true_positives + false_positives else 0.0
+    recall = true_positives / (true_positives + false_negatives) if true_positives + false_negatives else 0.0
+    with_founders = sum(1 for row in rows if row["founders"])
+
+    print(f"snippets:            {len(rows)} ({with_founders} name founders)")
+    print(f"answered by rules:   {answered} ({answered / len(rows):.0%} of LLM calls avoided)")
+    print(f"  precision:         {precision:.1%}")
+    print(f"  recall:            {recall:.1%} (of founders in answered snippets)")
+    print(f"  with a wrong name: {wrong_answers}")
+    print(f"left to the LLM:     {len(rows) - answered} ({missed_by_rules} of them name founders)")
+    print(f"time:                {elapsed * 1000 / len(rows):.2f} ms per snippet")
+
+
+if __name__ == "__main__":
+    main()